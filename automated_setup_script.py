@@ -290,16 +290,21 @@ def create_requirements_file(base_path):
     """Create requirements.txt file"""
     
     requirements_content = '''# Geospatial libraries
-geopandas>=0.14.0
+geopandas>=1.0.0
 rasterio>=1.3.0
 shapely>=2.0.0
 fiona>=1.8.0
+pyogrio>=0.8.0
 pyproj>=3.4.0
 
 # Data analysis
 pandas>=2.0.0
 numpy>=1.24.0
 scipy>=1.10.0
+pyarrow>=14.0.0
+
+# Optional: reading .7z archives
+# py7zr>=0.20.0
 
 # Visualization
 matplotlib>=3.7.0
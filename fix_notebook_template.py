@@ -52,6 +52,7 @@ def create_notebook_template():
                     "import seaborn as sns\n",
                     "from config import Config\n",
                     "from data_processing.vector_utils import VectorDataProcessor\n",
+                    "from analysis.geometry_ops import GeometryOperations\n",
                     "\n",
                     "# Initialize configuration and processors\n",
                     "config = Config()\n",
@@ -215,21 +216,22 @@ def create_notebook_template():
                     "if 'gdf' in locals():\n",
                     "    print(\"Performing basic spatial analysis...\")\n",
                     "    \n",
+                    "    # Operations run in an automatically chosen projected CRS (metres)\n",
+                    "    geometry_ops = GeometryOperations()\n",
+                    "    \n",
                     "    # Create buffer around geometries\n",
-                    "    buffer_distance = 0.5  # Adjust based on your data's coordinate system\n",
-                    "    gdf_buffered = gdf.copy()\n",
-                    "    gdf_buffered['geometry'] = gdf.geometry.buffer(buffer_distance)\n",
+                    "    buffer_distance = 50_000  # metres\n",
+                    "    gdf_buffered = geometry_ops.buffer(gdf, buffer_distance)\n",
                     "    \n",
-                    "    print(f\"Created buffers with distance: {buffer_distance}\")\n",
+                    "    print(f\"Created buffers with distance: {buffer_distance} m\")\n",
                     "    \n",
                     "    # Calculate centroids (for polygons)\n",
-                    "    gdf_centroids = gdf.copy()\n",
-                    "    gdf_centroids['geometry'] = gdf.geometry.centroid\n",
+                    "    gdf_centroids = geometry_ops.centroid(gdf)\n",
                     "    \n",
                     "    # If polygons, calculate area\n",
                     "    if gdf.geometry.iloc[0].geom_type in ['Polygon', 'MultiPolygon']:\n",
-                    "        gdf['area'] = gdf.geometry.area\n",
-                    "        print(f\"Calculated areas. Mean area: {gdf['area'].mean():.6f}\")\n",
+                    "        gdf['area'] = geometry_ops.area(gdf)\n",
+                    "        print(f\"Calculated areas. Mean area: {gdf['area'].mean():,.0f} m²\")\n",
                     "    \n",
                     "    # Visualize analysis results\n",
                     "    fig, ax = plt.subplots(figsize=(12, 8))\n",
@@ -1 +1,56 @@
-"""Spatial Analysis Module"""
\ No newline at end of file
+"""Spatial Analysis Module
+
+Submodules pull in geopandas, shapely and scipy, so they are imported on
+first attribute access rather than when the package is imported. No
+submodule may share a name with an export: importing a submodule binds it
+as a package attribute, which would hide the lazily loaded object.
+"""
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    "GeometryOperations": ".geometry_ops",
+    "projected_crs": ".geometry_ops",
+    "buffer": ".geometry_ops",
+    "centroid": ".geometry_ops",
+    "envelope": ".geometry_ops",
+    "area": ".geometry_ops",
+    "length": ".geometry_ops",
+    "PartitionedSpatialJoin": ".partitioned_join",
+    "spatial_join": ".partitioned_join",
+    "PointIndex": ".neighbors",
+    "nearest": ".neighbors",
+    "within_distance": ".neighbors",
+    "attach_neighbors": ".neighbors",
+    "PolygonAggregator": ".aggregation",
+    "aggregate_points": ".aggregation",
+    "TiledOverlay": ".tiled_overlay",
+    "overlay": ".tiled_overlay",
+    "ParallelDissolve": ".tree_dissolve",
+    "dissolve": ".tree_dissolve",
+    "ODMatrixBuilder": ".distance_matrix",
+    "od_matrix": ".distance_matrix",
+    "contiguity_weights": ".autocorrelation",
+    "knn_weights": ".autocorrelation",
+    "distance_band_weights": ".autocorrelation",
+    "row_standardize": ".autocorrelation",
+    "morans_i": ".autocorrelation",
+    "local_morans_i": ".autocorrelation",
+    "getis_ord_g_star": ".autocorrelation",
+    "DensityClustering": ".clustering",
+    "dbscan": ".clustering",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,255 @@
+"""
+Sparse Spatial Weights and Spatial Autocorrelation
+Path: E:\\GeoSpatial_Python\\GisProgramming\\src\\analysis\\autocorrelation.py
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+from scipy import sparse
+from scipy.spatial import cKDTree
+from scipy.stats import norm
+
+from .geometry_ops import projected_crs
+from .neighbors import point_coordinates
+
+# Bound on the (observations x permutations x neighbours) values held per batch
+PERMUTATION_BATCH_ELEMENTS = 8_000_000
+
+
+def _projected_points(gdf: gpd.GeoDataFrame) -> np.ndarray:
+    """Feature coordinates in a projected CRS (centroids for non-points)"""
+    crs = gdf.crs if gdf.crs is None or gdf.crs.is_projected else projected_crs(gdf)
+    return np.column_stack(point_coordinates(gdf, crs))
+
+
+def _symmetric_binary(rows: np.ndarray, cols: np.ndarray, n: int) -> sparse.csr_matrix:
+    weights = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, n))
+    weights = ((weights + weights.T) > 0).astype(np.float64)
+    weights.setdiag(0)
+    weights.eliminate_zeros()
+    return weights.tocsr()
+
+
+def contiguity_weights(gdf: gpd.GeoDataFrame, rook: bool = False) -> sparse.csr_matrix:
+    """Binary contiguity weights between polygons, found through an STRtree
+
+    Queen contiguity links polygons sharing any boundary point; rook
+    contiguity requires a shared edge of positive length.
+    """
+    geometries = np.asarray(gdf.geometry.values, dtype=object)
+    left, right = shapely.STRtree(geometries).query(geometries, predicate="intersects")
+    keep = left < right
+    left, right = left[keep], right[keep]
+    if rook:
+        shared = shapely.intersection(shapely.boundary(geometries[left]), shapely.boundary(geometries[right]))
+        keep = shapely.length(shared) > 0
+        left, right = left[keep], right[keep]
+    return _symmetric_binary(left, right, len(geometries))
+
+
+def knn_weights(gdf: gpd.GeoDataFrame, k: int = 8) -> sparse.csr_matrix:
+    """Binary weights linking every feature to its k nearest neighbours (not symmetric)"""
+    coords = _projected_points(gdf)
+    n = len(coords)
+    if k >= n:
+        raise ValueError(f"k must be smaller than the number of features ({n})")
+    _, neighbors = cKDTree(coords).query(coords, k=k + 1, workers=-1)
+    is_self = neighbors == np.arange(n)[:, None]
+    # With coincident points a feature may not find itself; drop its furthest hit instead
+    is_self[~is_self.any(axis=1), -1] = True
+    rows = np.repeat(np.arange(n), k)
+    cols = neighbors[~is_self]
+    return sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, n))
+
+
+def distance_band_weights(gdf: gpd.GeoDataFrame, threshold: float, binary: bool = True,
+                          alpha: float = -1.0) -> sparse.csr_matrix:
+    """Weights linking features within threshold distance (projected CRS units)
+
+    With binary=False the weights are distance ** alpha (inverse distance
+    by default), which is undefined for coincident features.
+    """
+    tree = cKDTree(_projected_points(gdf))
+    pairs = tree.query_pairs(threshold, output_type="ndarray")
+    n = tree.n
+    if binary:
+        return _symmetric_binary(pairs[:, 0], pairs[:, 1], n)
+    distances = np.linalg.norm(tree.data[pairs[:, 0]] - tree.data[pairs[:, 1]], axis=1)
+    if (distances == 0).any():
+        raise ValueError("Coincident features have no inverse-distance weight; use binary=True")
+    values = distances ** alpha
+    rows = np.concatenate([pairs[:, 0], pairs[:, 1]])
+    cols = np.concatenate([pairs[:, 1], pairs[:, 0]])
+    return sparse.csr_matrix((np.concatenate([values, values]), (rows, cols)), shape=(n, n))
+
+
+def row_standardize(weights: sparse.csr_matrix) -> sparse.csr_matrix:
+    """Scale every row to sum to 1 (rows of islands stay empty)"""
+    sums = np.asarray(weights.sum(axis=1)).ravel()
+    scale = np.divide(1.0, sums, out=np.zeros_like(sums), where=sums != 0)
+    return sparse.csr_matrix(sparse.diags(scale) @ weights)
+
+
+def _folded_p(simulated_larger: np.ndarray, permutations: int) -> np.ndarray:
+    """Pseudo p-value from the share of permutations at least as extreme (either tail)"""
+    larger = np.minimum(simulated_larger, permutations - simulated_larger)
+    return (larger + 1.0) / (permutations + 1.0)
+
+
+def _as_array(y) -> np.ndarray:
+    values = np.asarray(y, dtype=np.float64)
+    if np.isnan(values).any():
+        raise ValueError("The variable has missing values")
+    return values
+
+
+def morans_i(y, weights: sparse.csr_matrix, permutations: int = 999,
+             workers: Optional[int] = None, seed: Optional[int] = None) -> dict:
+    """Global Moran's I with normal-approximation and permutation inference
+
+    Permutations are evaluated in batches, each a single sparse-times-dense
+    product W @ Z over many permuted copies of the variable, spread over
+    worker threads.
+    """
+    z = _as_array(y)
+    z = z - z.mean()
+    n = len(z)
+    weights = sparse.csr_matrix(weights)
+    s0 = weights.sum()
+    zz = z @ z
+    statistic = n / s0 * (z @ (weights @ z)) / zz
+
+    expected = -1.0 / (n - 1)
+    symmetric = weights + weights.T
+    s1 = 0.5 * symmetric.multiply(symmetric).sum()
+    s2 = ((np.asarray(weights.sum(axis=1)).ravel() + np.asarray(weights.sum(axis=0)).ravel()) ** 2).sum()
+    variance = (n * n * s1 - n * s2 + 3 * s0 * s0) / ((n * n - 1) * s0 * s0) - expected ** 2
+    z_norm = (statistic - expected) / np.sqrt(variance)
+    result = {"I": float(statistic), "expected_I": expected, "z_norm": float(z_norm),
+              "p_norm": float(2 * norm.sf(abs(z_norm)))}
+
+    if permutations:
+        rng = np.random.default_rng(seed)
+        batch = max(1, PERMUTATION_BATCH_ELEMENTS // max(n, 1))
+        seeds = rng.integers(2 ** 63, size=-(-permutations // batch))
+        sizes = [min(batch, permutations - i * batch) for i in range(len(seeds))]
+
+        def simulate(size: int, batch_seed: int) -> np.ndarray:
+            batch_rng = np.random.default_rng(batch_seed)
+            permuted = np.column_stack([batch_rng.permutation(z) for _ in range(size)])
+            return n / s0 * np.einsum("ij,ij->j", permuted, weights @ permuted) / zz
+
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+            simulated = np.concatenate(list(executor.map(simulate, sizes, seeds)))
+        larger = (simulated >= statistic).sum()
+        result.update({"p_sim": float(_folded_p(larger, permutations)),
+                       "z_sim": float((statistic - simulated.mean()) / simulated.std())})
+    return result
+
+
+def _conditional_permutations(values: np.ndarray, weights: sparse.csr_matrix, permutations: int,
+                              count_larger: Callable[[np.ndarray, np.ndarray], np.ndarray],
+                              workers: Optional[int], seed: Optional[int]) -> np.ndarray:
+    """Conditional randomization shared by the local statistics
+
+    For each permutation the variable's other values are randomly placed on
+    each observation's neighbours (the observation itself stays put). The
+    same random draws serve every observation, shifted to skip the
+    observation itself, so observations with equal neighbour counts are
+    simulated together in vectorized batches. count_larger(observations,
+    simulated_lags) returns how many simulated statistics reach the
+    observed one. Returns that count per observation (-1 for islands).
+    """
+    n = len(values)
+    weights = sparse.csr_matrix(weights)
+    cardinality = np.diff(weights.indptr)
+    max_card = int(cardinality.max()) if n else 0
+    rng = np.random.default_rng(seed)
+    draws = np.vstack([rng.choice(n - 1, size=max_card, replace=False) for _ in range(permutations)]) \
+        if max_card else np.zeros((permutations, 0), dtype=np.int64)
+
+    tasks = []
+    for card in np.unique(cardinality[cardinality > 0]):
+        observations = np.flatnonzero(cardinality == card)
+        step = max(1, PERMUTATION_BATCH_ELEMENTS // (permutations * card))
+        tasks.extend((observations[i:i + step], card) for i in range(0, len(observations), step))
+
+    def simulate(observations: np.ndarray, card: int):
+        starts = weights.indptr[observations]
+        slots = starts[:, None] + np.arange(card)
+        neighbor_weights = weights.data[slots]
+        picks = draws[None, :, :card]
+        # Draws index the n - 1 other values; skip over the observation itself
+        picks = picks + (picks >= observations[:, None, None])
+        lags = np.einsum("opk,ok->op", values[picks], neighbor_weights)
+        return observations, count_larger(observations, lags)
+
+    larger = np.full(n, -1, dtype=np.int64)
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        for observations, counts in executor.map(lambda task: simulate(*task), tasks):
+            larger[observations] = counts
+    return larger
+
+
+def local_morans_i(y, weights: sparse.csr_matrix, permutations: int = 999,
+                   workers: Optional[int] = None, seed: Optional[int] = None) -> pd.DataFrame:
+    """Local Moran's I (LISA) with conditional permutation p-values
+
+    Returns a DataFrame aligned with y: Is, p_sim and quadrant (1 = high-high,
+    2 = low-high, 3 = low-low, 4 = high-low). Islands get NaN.
+    """
+    z = _as_array(y)
+    z = z - z.mean()
+    m2 = (z @ z) / len(z)
+    lag = sparse.csr_matrix(weights) @ z
+    statistic = z * lag / m2
+    quadrant = np.where(z > 0, np.where(lag > 0, 1, 4), np.where(lag > 0, 2, 3))
+
+    data = {"Is": statistic, "quadrant": quadrant}
+    if permutations:
+        def count_larger(observations: np.ndarray, lags: np.ndarray) -> np.ndarray:
+            simulated = z[observations, None] * lags / m2
+            return (simulated >= statistic[observations, None]).sum(axis=1)
+
+        larger = _conditional_permutations(z, weights, permutations, count_larger, workers, seed)
+        data["p_sim"] = np.where(larger >= 0, _folded_p(larger, permutations), np.nan)
+    islands = np.diff(sparse.csr_matrix(weights).indptr) == 0
+    data["Is"] = np.where(islands, np.nan, statistic)
+    return pd.DataFrame(data, index=getattr(y, "index", None))
+
+
+def getis_ord_g_star(y, weights: sparse.csr_matrix, permutations: int = 999,
+                     workers: Optional[int] = None, seed: Optional[int] = None) -> pd.DataFrame:
+    """Getis-Ord Gi* hot/cold spot z-scores (each feature counts as its own neighbour)
+
+    Returns a DataFrame aligned with y: Gi_star (z-score; positive means a
+    hot spot) and, with permutations, the conditional permutation p_sim.
+    """
+    x = _as_array(y)
+    n = len(x)
+    weights = sparse.csr_matrix(weights)
+    self_weight = np.ones(n)
+    lag = weights @ x + self_weight * x
+    weight_sum = np.asarray(weights.sum(axis=1)).ravel() + self_weight
+    weight_sq_sum = np.asarray(weights.multiply(weights).sum(axis=1)).ravel() + self_weight ** 2
+    mean = x.mean()
+    s = np.sqrt((x @ x) / n - mean ** 2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        statistic = (lag - mean * weight_sum) / (s * np.sqrt((n * weight_sq_sum - weight_sum ** 2) / (n - 1)))
+
+    data = {"Gi_star": statistic}
+    if permutations:
+        own = self_weight * x
+
+        def count_larger(observations: np.ndarray, lags: np.ndarray) -> np.ndarray:
+            return (lags + own[observations, None] >= lag[observations, None]).sum(axis=1)
+
+        larger = _conditional_permutations(x, weights, permutations, count_larger, workers, seed)
+        data["p_sim"] = np.where(larger >= 0, _folded_p(larger, permutations), np.nan)
+    return pd.DataFrame(data, index=getattr(y, "index", None))
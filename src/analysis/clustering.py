@@ -0,0 +1,133 @@
+"""
+Density-Based Clustering of Point Layers
+Path: E:\\GeoSpatial_Python\\GisProgramming\\src\\analysis\\clustering.py
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+import geopandas as gpd
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
+
+from .geometry_ops import projected_crs
+from .neighbors import point_coordinates
+from .partitioned_join import _assign_cells, _cell_of, _grid_edges, _group_by_cell
+
+NOISE = -1
+
+
+def _partition_edges(cell: int, coords: np.ndarray, ids: np.ndarray, own_cells: np.ndarray,
+                     eps: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Core-core links inside one partition; runs in a worker process
+
+    The partition holds its own core points plus every core point within
+    eps of its cell, so all links of its own points are found here. A link
+    is reported only by the partition owning its lower-numbered point, so
+    links crossing partition borders are reported exactly once.
+    """
+    pairs = cKDTree(coords).query_pairs(eps, output_type="ndarray")
+    first, second = pairs[:, 0], pairs[:, 1]
+    swap = ids[first] > ids[second]
+    first, second = np.where(swap, second, first), np.where(swap, first, second)
+    keep = own_cells[first] == cell
+    return ids[first[keep]], ids[second[keep]]
+
+
+class DensityClustering:
+    """DBSCAN clustering with KD-tree neighbourhood queries in projected coordinates
+
+    A point is a core point when at least min_samples points (itself
+    included) lie within eps; core points within eps of each other share a
+    cluster, border points join the cluster of their nearest core point and
+    everything else is noise (label -1). eps is in the units of the layer's
+    projected CRS, chosen automatically (in metres) for geographic layers.
+
+    Core-core links are found per spatial partition in worker processes;
+    each partition also holds the core points within eps beyond its cell,
+    so clusters spanning partitions are merged when the links are joined
+    into connected components.
+    """
+
+    def __init__(self, eps: float, min_samples: int = 5, workers: Optional[int] = None,
+                 partitions: Optional[int] = None, parallel_threshold: int = 200_000):
+        self.eps = eps
+        self.min_samples = min_samples
+        self.workers = workers or os.cpu_count() or 1
+        self.partitions = partitions or self.workers * 4
+        self.parallel_threshold = parallel_threshold
+
+    def fit(self, gdf: gpd.GeoDataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """(cluster label, is-core flag) for every feature"""
+        crs = gdf.crs if gdf.crs is None or gdf.crs.is_projected else projected_crs(gdf)
+        coords = np.column_stack(point_coordinates(gdf, crs))
+        labels = np.full(len(coords), NOISE, dtype=np.int64)
+        core = np.zeros(len(coords), dtype=bool)
+        valid = np.flatnonzero(np.isfinite(coords).all(axis=1))
+        if len(valid) == 0:
+            return labels, core
+        coords = coords[valid]
+
+        counts = cKDTree(coords).query_ball_point(coords, self.eps, return_length=True,
+                                                  workers=self.workers)
+        core_idx = np.flatnonzero(counts >= self.min_samples)
+        if len(core_idx) == 0:
+            return labels, core
+        core_coords = coords[core_idx]
+
+        first, second = self._core_links(core_coords)
+        graph = sparse.csr_matrix((np.ones(len(first), dtype=np.int8), (first, second)),
+                                  shape=(len(core_idx), len(core_idx)))
+        _, core_labels = connected_components(graph, directed=False)
+
+        point_labels = np.full(len(coords), NOISE, dtype=np.int64)
+        point_labels[core_idx] = core_labels
+        border = np.setdiff1d(np.arange(len(coords)), core_idx)
+        if len(border):
+            distances, nearest = cKDTree(core_coords).query(coords[border], k=1,
+                                                            distance_upper_bound=self.eps,
+                                                            workers=self.workers)
+            reached = np.isfinite(distances)
+            point_labels[border[reached]] = core_labels[nearest[reached]]
+
+        labels[valid] = point_labels
+        core[valid[core_idx]] = True
+        return labels, core
+
+    def _core_links(self, core_coords: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Pairs of core points (positions in core_coords) within eps of each other"""
+        if self.workers == 1 or len(core_coords) < self.parallel_threshold:
+            pairs = cKDTree(core_coords).query_pairs(self.eps, output_type="ndarray")
+            return pairs[:, 0], pairs[:, 1]
+
+        points = np.column_stack([core_coords, core_coords])
+        x_edges, y_edges = _grid_edges(points, math.ceil(math.sqrt(self.partitions)))
+        own_cells = _cell_of(core_coords[:, 0], x_edges) * (len(y_edges) + 1) + _cell_of(core_coords[:, 1], y_edges)
+        # Every point joins each partition its eps-neighbourhood reaches (its own and halos)
+        reach = points + np.array([-self.eps, -self.eps, self.eps, self.eps])
+        members = _group_by_cell(*_assign_cells(reach, x_edges, y_edges))
+
+        tasks = [(cell, core_coords[ids], ids, own_cells[ids], self.eps) for cell, ids in members.items()]
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(_partition_edges, *zip(*tasks)))
+        return (np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results]))
+
+    def cluster(self, gdf: gpd.GeoDataFrame, column: str = "cluster",
+                core_column: Optional[str] = None) -> gpd.GeoDataFrame:
+        """Copy of gdf with cluster labels (and optionally core flags) written to columns"""
+        labels, core = self.fit(gdf)
+        result = gdf.copy()
+        result[column] = labels
+        if core_column:
+            result[core_column] = core
+        return result
+
+
+def dbscan(gdf: gpd.GeoDataFrame, eps: float, min_samples: int = 5, column: str = "cluster",
+           workers: Optional[int] = None) -> gpd.GeoDataFrame:
+    """Convenience function to label density-based clusters of a point layer"""
+    return DensityClustering(eps, min_samples, workers).cluster(gdf, column)
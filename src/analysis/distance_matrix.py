@@ -0,0 +1,211 @@
+"""
+Blocked Origin-Destination Distance Matrices
+Path: E:\\GeoSpatial_Python\\GisProgramming\\src\\analysis\\distance_matrix.py
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+import geopandas as gpd
+import numpy as np
+from pyproj import CRS
+from scipy import sparse
+
+from .geometry_ops import projected_crs
+from .neighbors import EARTH_RADIUS, METRICS, point_coordinates
+
+
+def _euclidean(ox: np.ndarray, oy: np.ndarray, dx: np.ndarray, dy: np.ndarray) -> np.ndarray:
+    return np.hypot(ox[:, None] - dx[None, :], oy[:, None] - dy[None, :])
+
+
+def _haversine(olon: np.ndarray, olat: np.ndarray, dlon: np.ndarray, dlat: np.ndarray) -> np.ndarray:
+    """Great-circle metres between radian coordinates"""
+    a = (np.sin((dlat[None, :] - olat[:, None]) / 2) ** 2 +
+         np.cos(olat)[:, None] * np.cos(dlat)[None, :] * np.sin((dlon[None, :] - olon[:, None]) / 2) ** 2)
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def _bounded_map(executor: ThreadPoolExecutor, func: Callable, tasks: Iterable,
+                 window: int) -> Iterator:
+    """executor.map that keeps at most window tasks (and results) in flight"""
+    pending = deque()
+    for task in tasks:
+        pending.append(executor.submit(func, *task))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+class ODMatrixBuilder:
+    """Distances between every origin and destination, computed in blocks
+
+    Distances are computed for origin_block x destination_block tiles at a
+    time on a pool of threads (NumPy releases the GIL inside the block
+    arithmetic), so memory stays bounded by the tiles in flight. The full
+    matrix can be returned, written to a memory-mapped .npy file or
+    streamed to Parquet. A sparse matrix holding only the k nearest and/or
+    within-max_distance destinations per origin never materialises it.
+
+    metric="euclidean" measures in the origins' projected CRS (chosen
+    automatically for geographic layers); metric="haversine" gives
+    great-circle metres. Non-point geometries use their centroids.
+    """
+
+    def __init__(self, metric: str = "euclidean", workers: Optional[int] = None,
+                 origin_block: int = 1024, destination_block: int = 8192, dtype=np.float64):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        self.metric = metric
+        self.workers = workers or os.cpu_count() or 1
+        self.origin_block = origin_block
+        self.destination_block = destination_block
+        self.dtype = np.dtype(dtype)
+
+    def _prepare(self, origins: gpd.GeoDataFrame, destinations: gpd.GeoDataFrame) -> None:
+        if origins.crs is None or destinations.crs is None:
+            raise ValueError("Origins and destinations need a CRS")
+        if self.metric == "haversine":
+            crs = CRS.from_epsg(4326)
+        else:
+            crs = origins.crs if origins.crs.is_projected else projected_crs(origins)
+        self._origins = point_coordinates(origins, crs)
+        self._destinations = point_coordinates(destinations, crs)
+        if self.metric == "haversine":
+            self._origins = tuple(np.radians(c) for c in self._origins)
+            self._destinations = tuple(np.radians(c) for c in self._destinations)
+        self._kernel = _haversine if self.metric == "haversine" else _euclidean
+        self.shape = (len(origins), len(destinations))
+
+    def _block(self, rows: slice, cols: slice) -> np.ndarray:
+        ox, oy = self._origins
+        dx, dy = self._destinations
+        return self._kernel(ox[rows], oy[rows], dx[cols], dy[cols]).astype(self.dtype, copy=False)
+
+    def _tiles(self) -> Iterator[Tuple[slice, slice]]:
+        n, m = self.shape
+        for row in range(0, n, self.origin_block):
+            for col in range(0, m, self.destination_block):
+                yield (slice(row, min(row + self.origin_block, n)),
+                       slice(col, min(col + self.destination_block, m)))
+
+    def matrix(self, origins: gpd.GeoDataFrame, destinations: gpd.GeoDataFrame,
+               path: Optional[Path] = None) -> np.ndarray:
+        """The full (origins x destinations) matrix, in memory or as a .npy memmap at path"""
+        self._prepare(origins, destinations)
+        if path is None:
+            out = np.empty(self.shape, dtype=self.dtype)
+        else:
+            out = np.lib.format.open_memmap(Path(path), mode="w+", dtype=self.dtype, shape=self.shape)
+
+        def fill(rows: slice, cols: slice) -> None:
+            out[rows, cols] = self._block(rows, cols)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for _ in _bounded_map(executor, fill, self._tiles(), self.workers * 2):
+                pass
+        if path is not None:
+            out.flush()
+        return out
+
+    def nearest(self, origins: gpd.GeoDataFrame, destinations: gpd.GeoDataFrame,
+                k: Optional[int] = None, max_distance: Optional[float] = None) -> sparse.csr_matrix:
+        """Sparse matrix keeping each origin's k nearest and/or within-max_distance destinations
+
+        Stored entries are distances; pairs left out are absent (note that
+        a stored distance can itself be 0 for coincident points).
+        """
+        rows, cols, values = self._reduced_pairs(origins, destinations, k, max_distance)
+        return sparse.csr_matrix((values, (rows, cols)), shape=self.shape)
+
+    def to_parquet(self, origins: gpd.GeoDataFrame, destinations: gpd.GeoDataFrame, path: Path,
+                   k: Optional[int] = None, max_distance: Optional[float] = None) -> Path:
+        """Stream (origin, destination, distance) rows to a Parquet file
+
+        origin and destination hold the input frames' index labels. Without
+        k or max_distance every pair is written, one tile at a time.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        path = Path(path)
+        if k is None and max_distance is None:
+            self._prepare(origins, destinations)
+            batches = self._full_pairs()
+        else:
+            batches = [self._reduced_pairs(origins, destinations, k, max_distance)]
+
+        writer = None
+        try:
+            for rows, cols, values in batches:
+                table = pa.table({"origin": origins.index.to_numpy()[rows],
+                                  "destination": destinations.index.to_numpy()[cols],
+                                  "distance": values})
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        return path
+
+    def _full_pairs(self) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        def pairs(rows: slice, cols: slice):
+            block = self._block(rows, cols)
+            r, c = np.indices(block.shape)
+            return (r.ravel() + rows.start, c.ravel() + cols.start, block.ravel())
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            yield from _bounded_map(executor, pairs, self._tiles(), self.workers * 2)
+
+    def _reduced_pairs(self, origins: gpd.GeoDataFrame, destinations: gpd.GeoDataFrame,
+                       k: Optional[int], max_distance: Optional[float]
+                       ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if k is None and max_distance is None:
+            raise ValueError("Give k, max_distance or both")
+        self._prepare(origins, destinations)
+        n, m = self.shape
+        limit = np.inf if max_distance is None else max_distance
+
+        def reduce(rows: slice):
+            best_d = np.empty((rows.stop - rows.start, 0), dtype=self.dtype)
+            best_j = np.empty((rows.stop - rows.start, 0), dtype=np.int64)
+            parts = []
+            for col in range(0, m, self.destination_block):
+                cols = slice(col, min(col + self.destination_block, m))
+                block = self._block(rows, cols)
+                block[~(block <= limit)] = np.inf
+                if k is None:
+                    r, c = np.nonzero(np.isfinite(block))
+                    parts.append((r + rows.start, c + col, block[r, c]))
+                    continue
+                # Running top-k: merge the block into the best candidates so far
+                best_d = np.hstack([best_d, block])
+                best_j = np.hstack([best_j, np.broadcast_to(np.arange(cols.start, cols.stop), block.shape)])
+                if best_d.shape[1] > k:
+                    keep = np.argpartition(best_d, k - 1, axis=1)[:, :k]
+                    best_d = np.take_along_axis(best_d, keep, axis=1)
+                    best_j = np.take_along_axis(best_j, keep, axis=1)
+            if k is not None:
+                r, c = np.nonzero(np.isfinite(best_d))
+                parts.append((r + rows.start, best_j[r, c], best_d[r, c]))
+            return parts
+
+        blocks = ((slice(row, min(row + self.origin_block, n)),) for row in range(0, n, self.origin_block))
+        parts = []
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for block_parts in _bounded_map(executor, reduce, blocks, self.workers * 2):
+                parts.extend(block_parts)
+        if not parts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=self.dtype)
+        return tuple(np.concatenate(arrays) for arrays in zip(*parts))
+
+
+def od_matrix(origins: gpd.GeoDataFrame, destinations: gpd.GeoDataFrame, metric: str = "euclidean",
+              path: Optional[Path] = None, workers: Optional[int] = None) -> np.ndarray:
+    """Convenience function for a full origin-destination distance matrix"""
+    return ODMatrixBuilder(metric, workers).matrix(origins, destinations, path)
@@ -0,0 +1,162 @@
+"""
+Vectorized Geometry Operations
+Path: E:\\GeoSpatial_Python\\GisProgramming\\src\\analysis\\geometry_ops.py
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+from pyproj import CRS
+
+try:
+    from ..data_processing.reprojection import transform_geometries
+except ImportError:
+    # Imported as a top-level package with src/ on sys.path (notebooks)
+    from data_processing.reprojection import transform_geometries
+
+# Shapely 2 ufuncs behind each operation; measures return floats, the rest geometries
+OPERATIONS = {
+    "buffer": shapely.buffer,
+    "centroid": shapely.centroid,
+    "envelope": shapely.envelope,
+    "area": shapely.area,
+    "length": shapely.length,
+}
+MEASURES = {"area", "length"}
+
+# Extents wider than this (in degrees of longitude) do not fit a UTM zone
+UTM_MAX_SPAN = 12.0
+
+
+def projected_crs(gdf: gpd.GeoDataFrame) -> CRS:
+    """Metric CRS to measure gdf in
+
+    Projected data keeps its CRS. Geographic data gets the UTM zone of its
+    centre when it spans a few zones at most, otherwise a Lambert azimuthal
+    equal-area projection centred on the data, so areas stay exact and
+    distances stay close across a continent.
+    """
+    if gdf.crs is None:
+        raise ValueError("Cannot pick a projected CRS for data without a CRS")
+    if gdf.crs.is_projected:
+        return gdf.crs
+
+    # Geographic CRSs are in degrees, so the bounds need no transformation
+    minx, miny, maxx, maxy = gdf.total_bounds
+    if not np.isfinite([minx, miny, maxx, maxy]).all():
+        raise ValueError("Cannot pick a projected CRS for empty geometries")
+    if maxx - minx <= UTM_MAX_SPAN and abs(miny) < 84 and abs(maxy) < 84:
+        return gdf.estimate_utm_crs()
+    return CRS.from_proj4(f"+proj=laea +lat_0={(miny + maxy) / 2} +lon_0={(minx + maxx) / 2} "
+                          "+x_0=0 +y_0=0 +datum=WGS84 +units=m +no_defs")
+
+
+def _apply(operation: str, geometries: np.ndarray, src_crs, work_crs, kwargs: dict) -> np.ndarray:
+    """Run one operation in the working CRS, returning geometries in the source CRS"""
+    if work_crs is not None:
+        geometries = transform_geometries(geometries, src_crs, work_crs)
+    result = OPERATIONS[operation](geometries, **kwargs)
+    if work_crs is not None and operation not in MEASURES:
+        result = transform_geometries(result, work_crs, src_crs)
+    return result
+
+
+def _apply_wkb_chunk(operation: str, wkb: np.ndarray, src_wkt: Optional[str],
+                     work_wkt: Optional[str], kwargs: dict) -> np.ndarray:
+    """Worker entry point: WKB in, WKB (or measures) out"""
+    result = _apply(operation, shapely.from_wkb(wkb), src_wkt, work_wkt, kwargs)
+    return result if operation in MEASURES else shapely.to_wkb(result)
+
+
+class GeometryOperations:
+    """Buffer, centroid, area, length and envelope over whole GeoDataFrames
+
+    Geographic data is moved to projected_crs() (or working_crs, if given) so
+    distances are in metres and areas in square metres; geometric results
+    come back in the input CRS. Frames with at least parallel_threshold rows
+    are split into chunks processed in worker processes.
+    """
+
+    def __init__(self, workers: Optional[int] = None, parallel_threshold: int = 500_000,
+                 working_crs=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel_threshold = parallel_threshold
+        self.working_crs = working_crs
+
+    def buffer(self, gdf: gpd.GeoDataFrame, distance: float, **buffer_options) -> gpd.GeoDataFrame:
+        """Buffer every geometry by distance metres (quad_segs, cap_style, ... pass through)"""
+        return self._replace_geometry(gdf, self._run("buffer", gdf, distance=distance, **buffer_options))
+
+    def centroid(self, gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+        """Centroids computed in the projected CRS"""
+        return self._replace_geometry(gdf, self._run("centroid", gdf))
+
+    def envelope(self, gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+        """Bounding rectangles in the input CRS"""
+        return self._replace_geometry(gdf, self._run("envelope", gdf, project=False))
+
+    def area(self, gdf: gpd.GeoDataFrame) -> pd.Series:
+        """Area of every geometry in square metres (projected CRS units)"""
+        return pd.Series(self._run("area", gdf), index=gdf.index, name="area")
+
+    def length(self, gdf: gpd.GeoDataFrame) -> pd.Series:
+        """Length (perimeter for polygons) of every geometry in metres"""
+        return pd.Series(self._run("length", gdf), index=gdf.index, name="length")
+
+    def _run(self, operation: str, gdf: gpd.GeoDataFrame, project: bool = True, **kwargs) -> np.ndarray:
+        geometries = np.asarray(gdf.geometry.values, dtype=object)
+        work_crs = None
+        if project and len(gdf):
+            work_crs = CRS.from_user_input(self.working_crs) if self.working_crs else projected_crs(gdf)
+            if work_crs == gdf.crs:
+                work_crs = None
+
+        if len(geometries) < self.parallel_threshold or self.workers == 1:
+            return _apply(operation, geometries, gdf.crs, work_crs, kwargs)
+
+        src_wkt = gdf.crs.to_wkt() if gdf.crs is not None else None
+        work_wkt = work_crs.to_wkt() if work_crs is not None else None
+        chunks = np.array_split(shapely.to_wkb(geometries), self.workers)
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(_apply_wkb_chunk, [operation] * len(chunks), chunks,
+                                        [src_wkt] * len(chunks), [work_wkt] * len(chunks),
+                                        [kwargs] * len(chunks)))
+        result = np.concatenate(results)
+        return result if operation in MEASURES else shapely.from_wkb(result)
+
+    @staticmethod
+    def _replace_geometry(gdf: gpd.GeoDataFrame, geometries: np.ndarray) -> gpd.GeoDataFrame:
+        result = gdf.copy()
+        result[gdf.geometry.name] = gpd.GeoSeries(geometries, index=gdf.index, crs=gdf.crs)
+        return result
+
+
+def buffer(gdf: gpd.GeoDataFrame, distance: float, workers: Optional[int] = None,
+           **buffer_options) -> gpd.GeoDataFrame:
+    """Convenience function to buffer a GeoDataFrame by distance metres"""
+    return GeometryOperations(workers=workers).buffer(gdf, distance, **buffer_options)
+
+
+def centroid(gdf: gpd.GeoDataFrame, workers: Optional[int] = None) -> gpd.GeoDataFrame:
+    """Convenience function for projected centroids"""
+    return GeometryOperations(workers=workers).centroid(gdf)
+
+
+def envelope(gdf: gpd.GeoDataFrame, workers: Optional[int] = None) -> gpd.GeoDataFrame:
+    """Convenience function for bounding rectangles"""
+    return GeometryOperations(workers=workers).envelope(gdf)
+
+
+def area(gdf: gpd.GeoDataFrame, workers: Optional[int] = None) -> pd.Series:
+    """Convenience function for areas in square metres"""
+    return GeometryOperations(workers=workers).area(gdf)
+
+
+def length(gdf: gpd.GeoDataFrame, workers: Optional[int] = None) -> pd.Series:
+    """Convenience function for lengths in metres"""
+    return GeometryOperations(workers=workers).length(gdf)
@@ -0,0 +1,188 @@
+"""
+Nearest-Neighbour and Radius Queries
+Path: E:\\GeoSpatial_Python\\GisProgramming\\src\\analysis\\neighbors.py
+"""
+
+import os
+from typing import Iterator, Optional, Tuple
+
+import geopandas as gpd
+import numpy as np
+import shapely
+from pyproj import CRS
+from scipy.spatial import cKDTree
+
+from .geometry_ops import projected_crs
+
+try:
+    from ..data_processing.reprojection import transform_coordinates
+except ImportError:
+    # Imported as a top-level package with src/ on sys.path (notebooks)
+    from data_processing.reprojection import transform_coordinates
+
+EARTH_RADIUS = 6_371_008.8  # mean radius in metres
+METRICS = ("euclidean", "haversine")
+
+
+def point_coordinates(gdf: gpd.GeoDataFrame, crs) -> Tuple[np.ndarray, np.ndarray]:
+    """x and y of every feature in crs (centroids for non-points, NaN where empty)"""
+    geometries = np.asarray(gdf.geometry.values, dtype=object)
+    is_point = shapely.get_type_id(geometries) == 0
+    if not is_point.all():
+        geometries = np.where(is_point, geometries, shapely.centroid(geometries))
+    x, y = shapely.get_x(geometries), shapely.get_y(geometries)
+    if gdf.crs != crs:
+        x, y = transform_coordinates(x, y, gdf.crs, crs)
+    return x, y
+
+
+def _unit_sphere(lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+    """Lon/lat in degrees to 3D points on the unit sphere
+
+    Straight-line (chord) distance between these points grows monotonically
+    with great-circle distance, so a plain KD-tree answers haversine queries.
+    """
+    lon, lat = np.radians(lon), np.radians(lat)
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def _chord_to_metres(chord: np.ndarray) -> np.ndarray:
+    return 2 * EARTH_RADIUS * np.arcsin(np.clip(chord / 2, 0, 1))
+
+
+def _metres_to_chord(distance: float) -> float:
+    return 2 * np.sin(min(distance / EARTH_RADIUS, np.pi) / 2)
+
+
+class PointIndex:
+    """KD-tree over a point layer for batched k-NN and radius queries
+
+    metric="euclidean" measures in a projected CRS (geographic layers are
+    moved to projected_crs() first) and reports distances in its units.
+    metric="haversine" measures great-circle distance in metres on the mean
+    Earth sphere. Non-point geometries are represented by their centroids.
+    Queries are answered in batches of batch_size points, each spread over
+    workers threads (scipy releases the GIL while querying).
+    """
+
+    def __init__(self, gdf: gpd.GeoDataFrame, metric: str = "euclidean",
+                 workers: Optional[int] = None, batch_size: int = 250_000):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        if gdf.crs is None:
+            raise ValueError("The indexed layer needs a CRS")
+        self.gdf = gdf
+        self.metric = metric
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        if metric == "haversine":
+            self.crs = CRS.from_epsg(4326)
+        else:
+            self.crs = gdf.crs if gdf.crs.is_projected else projected_crs(gdf)
+
+        coords = self._coordinates(gdf)
+        # Features without a location cannot be neighbours
+        self._positions = np.flatnonzero(np.isfinite(coords).all(axis=1))
+        self.tree = cKDTree(coords[self._positions])
+
+    def _coordinates(self, gdf: gpd.GeoDataFrame) -> np.ndarray:
+        """Tree-space coordinates of each feature (NaN where it has none)"""
+        x, y = point_coordinates(gdf, self.crs)
+        if self.metric == "haversine":
+            return _unit_sphere(x, y)
+        return np.column_stack([x, y])
+
+    def _batches(self, query: gpd.GeoDataFrame) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        if query.crs is None:
+            raise ValueError("The query layer needs a CRS")
+        coords = self._coordinates(query)
+        for start in range(0, len(coords), self.batch_size):
+            batch = coords[start:start + self.batch_size]
+            valid = np.flatnonzero(np.isfinite(batch).all(axis=1))
+            yield start + valid, batch[valid]
+
+    def knn(self, query: gpd.GeoDataFrame, k: int = 1,
+            max_distance: Optional[float] = None) -> gpd.GeoDataFrame:
+        """The k nearest indexed features of every query feature
+
+        Returns one row per (query feature, neighbour) pair: the query
+        feature's columns plus neighbor_index (index label in the indexed
+        layer), neighbor_distance and neighbor_rank (1 = nearest). Pairs
+        further than max_distance are left out.
+        """
+        upper = np.inf
+        if max_distance is not None:
+            upper = _metres_to_chord(max_distance) if self.metric == "haversine" else max_distance
+        query_parts, neighbor_parts, distance_parts, rank_parts = [], [], [], []
+        for positions, coords in self._batches(query):
+            distances, neighbors = self.tree.query(coords, k=k, distance_upper_bound=upper,
+                                                   workers=self.workers)
+            distances, neighbors = distances.reshape(len(coords), k), neighbors.reshape(len(coords), k)
+            found = np.isfinite(distances)
+            query_parts.append(np.repeat(positions, k).reshape(len(coords), k)[found])
+            neighbor_parts.append(neighbors[found])
+            distance_parts.append(distances[found])
+            rank_parts.append(np.broadcast_to(np.arange(1, k + 1), (len(coords), k))[found])
+
+        result = self._pairs_frame(query, query_parts, neighbor_parts, distance_parts)
+        result["neighbor_rank"] = np.concatenate(rank_parts) if rank_parts else np.zeros(0, dtype=int)
+        return result
+
+    def within(self, query: gpd.GeoDataFrame, radius: float) -> gpd.GeoDataFrame:
+        """Every indexed feature within radius of each query feature
+
+        Returns one row per pair, sorted by query feature then distance, with
+        the query feature's columns plus neighbor_index and neighbor_distance.
+        """
+        chord = _metres_to_chord(radius) if self.metric == "haversine" else radius
+        query_parts, neighbor_parts, distance_parts = [], [], []
+        for positions, coords in self._batches(query):
+            matches = self.tree.query_ball_point(coords, chord, workers=self.workers,
+                                                 return_sorted=False)
+            counts = np.fromiter((len(m) for m in matches), dtype=np.int64, count=len(matches))
+            if counts.sum() == 0:
+                continue
+            neighbors = np.concatenate([m for m in matches if m]).astype(np.int64)
+            rows = np.repeat(np.arange(len(coords)), counts)
+            distances = np.linalg.norm(coords[rows] - self.tree.data[neighbors], axis=1)
+            order = np.lexsort((distances, rows))
+            query_parts.append(positions[rows[order]])
+            neighbor_parts.append(neighbors[order])
+            distance_parts.append(distances[order])
+        return self._pairs_frame(query, query_parts, neighbor_parts, distance_parts)
+
+    def _pairs_frame(self, query: gpd.GeoDataFrame, query_parts: list,
+                     neighbor_parts: list, distance_parts: list) -> gpd.GeoDataFrame:
+        empty = np.zeros(0, dtype=np.int64)
+        query_positions = np.concatenate(query_parts) if query_parts else empty
+        neighbors = np.concatenate(neighbor_parts) if neighbor_parts else empty
+        distances = np.concatenate(distance_parts) if distance_parts else np.zeros(0)
+        if self.metric == "haversine":
+            distances = _chord_to_metres(distances)
+
+        result = query.iloc[query_positions].copy()
+        result["neighbor_index"] = self.gdf.index[self._positions[neighbors]]
+        result["neighbor_distance"] = distances
+        return result
+
+
+def nearest(query: gpd.GeoDataFrame, target: gpd.GeoDataFrame, k: int = 1,
+            metric: str = "euclidean", max_distance: Optional[float] = None,
+            workers: Optional[int] = None) -> gpd.GeoDataFrame:
+    """Convenience function: k nearest target features of each query feature"""
+    return PointIndex(target, metric, workers).knn(query, k, max_distance)
+
+
+def within_distance(query: gpd.GeoDataFrame, target: gpd.GeoDataFrame, radius: float,
+                    metric: str = "euclidean", workers: Optional[int] = None) -> gpd.GeoDataFrame:
+    """Convenience function: target features within radius of each query feature"""
+    return PointIndex(target, metric, workers).within(query, radius)
+
+
+def attach_neighbors(pairs: gpd.GeoDataFrame, target: gpd.GeoDataFrame, columns: list,
+                     suffix: str = "_neighbor") -> gpd.GeoDataFrame:
+    """Add target attribute columns to the pairs returned by knn() or within()"""
+    attributes = target[columns].add_suffix(suffix)
+    matched = attributes.loc[pairs["neighbor_index"]]
+    return pairs.assign(**{c: matched[c].to_numpy() for c in attributes.columns})
@@ -0,0 +1,228 @@
+"""
+Partitioned Parallel Spatial Join
+Path: E:\\GeoSpatial_Python\\GisProgramming\\src\\analysis\\partitioned_join.py
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+try:
+    from ..data_processing.reprojection import reproject
+except ImportError:
+    # Imported as a top-level package with src/ on sys.path (notebooks)
+    from data_processing.reprojection import reproject
+
+# Predicates that imply intersecting bounding boxes, which partitioning relies on
+PREDICATES = {"intersects", "within", "contains", "overlaps", "crosses", "touches",
+              "covers", "covered_by", "contains_properly"}
+
+# Centres used to place grid lines; more adds cost without better balance
+EDGE_SAMPLE_SIZE = 1_000_000
+
+FrameOrChunks = Union[gpd.GeoDataFrame, Iterable[gpd.GeoDataFrame]]
+
+
+def _grid_edges(bounds: np.ndarray, cells_per_axis: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Interior grid lines at quantiles of the box centres, so skewed data balances"""
+    if cells_per_axis <= 1 or len(bounds) == 0:
+        return np.zeros(0), np.zeros(0)
+    if len(bounds) > EDGE_SAMPLE_SIZE:
+        bounds = bounds[np.random.default_rng(0).choice(len(bounds), EDGE_SAMPLE_SIZE, replace=False)]
+    quantiles = np.arange(1, cells_per_axis) / cells_per_axis
+    x_edges = np.unique(np.quantile((bounds[:, 0] + bounds[:, 2]) / 2, quantiles))
+    y_edges = np.unique(np.quantile((bounds[:, 1] + bounds[:, 3]) / 2, quantiles))
+    return x_edges, y_edges
+
+
+def _cell_of(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    return np.searchsorted(edges, values, side="right")
+
+
+def _assign_cells(bounds: np.ndarray, x_edges: np.ndarray, y_edges: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(row position, cell id) for every grid cell each box overlaps"""
+    x0, x1 = _cell_of(bounds[:, 0], x_edges), _cell_of(bounds[:, 2], x_edges)
+    y0, y1 = _cell_of(bounds[:, 1], y_edges), _cell_of(bounds[:, 3], y_edges)
+    nx, ny = x1 - x0 + 1, y1 - y0 + 1
+    counts = nx * ny
+    positions = np.repeat(np.arange(len(bounds)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    cx = x0[positions] + offsets % nx[positions]
+    cy = y0[positions] + offsets // nx[positions]
+    return positions, cx * (len(y_edges) + 1) + cy
+
+
+def _group_by_cell(positions: np.ndarray, cells: np.ndarray) -> dict:
+    order = np.argsort(cells, kind="stable")
+    cells, positions = cells[order], positions[order]
+    starts = np.flatnonzero(np.r_[True, cells[1:] != cells[:-1]])
+    return dict(zip(cells[starts].tolist(), np.split(positions, starts[1:])))
+
+
+def _join_cell(cell: int, left_geoms: np.ndarray, left_pos: np.ndarray,
+               right_geoms: np.ndarray, right_pos: np.ndarray, predicate: str,
+               x_edges: np.ndarray, y_edges: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Join one grid cell against its own STRtree
+
+    A pair found in several cells is kept only by the cell holding the
+    lower-left corner of the overlap of the two bounding boxes, so features
+    crossing cell edges are reported exactly once.
+    """
+    tree = shapely.STRtree(right_geoms)
+    li, ri = tree.query(left_geoms, predicate=predicate)
+    if len(x_edges) or len(y_edges):
+        lb, rb = shapely.bounds(left_geoms[li]), shapely.bounds(right_geoms[ri])
+        ref_x = np.maximum(lb[:, 0], rb[:, 0])
+        ref_y = np.maximum(lb[:, 1], rb[:, 1])
+        keep = _cell_of(ref_x, x_edges) * (len(y_edges) + 1) + _cell_of(ref_y, y_edges) == cell
+        li, ri = li[keep], ri[keep]
+    return left_pos[li], right_pos[ri]
+
+
+def _join_cell_wkb(cell: int, left_wkb: np.ndarray, left_pos: np.ndarray,
+                   right_wkb: np.ndarray, right_pos: np.ndarray, predicate: str,
+                   x_edges: np.ndarray, y_edges: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Worker entry point: geometries travel as WKB, which pickles far faster"""
+    return _join_cell(cell, shapely.from_wkb(left_wkb), left_pos, shapely.from_wkb(right_wkb),
+                      right_pos, predicate, x_edges, y_edges)
+
+
+class PartitionedSpatialJoin:
+    """Spatial join that partitions both layers on a grid and joins cells in parallel
+
+    Grid lines sit at quantiles of the left layer's feature centres so cells
+    hold similar numbers of features. Each cell is joined in a worker process
+    against an STRtree of the right-hand features overlapping it. Inputs
+    smaller than parallel_threshold rows are joined in-process in one piece.
+    The left input may be a chunk iterator (e.g. iter_vector_chunks), which
+    is joined one chunk at a time.
+    """
+
+    def __init__(self, workers: Optional[int] = None, partitions: Optional[int] = None,
+                 parallel_threshold: int = 200_000):
+        self.workers = workers or os.cpu_count() or 1
+        self.partitions = partitions or self.workers * 4
+        self.parallel_threshold = parallel_threshold
+
+    def join(self, left: FrameOrChunks, right: FrameOrChunks, how: str = "inner",
+             predicate: str = "intersects", lsuffix: str = "left", rsuffix: str = "right") -> gpd.GeoDataFrame:
+        """Join like gpd.sjoin(left, right, how, predicate); how is "inner" or "left" """
+        if isinstance(left, gpd.GeoDataFrame):
+            return next(self.iter_join([left], right, how, predicate, lsuffix, rsuffix))
+        results = list(self.iter_join(left, right, how, predicate, lsuffix, rsuffix))
+        if not results:
+            return gpd.GeoDataFrame()
+        return gpd.GeoDataFrame(pd.concat(results), crs=results[0].crs)
+
+    def iter_join(self, left_chunks: Iterable[gpd.GeoDataFrame], right: FrameOrChunks,
+                  how: str = "inner", predicate: str = "intersects",
+                  lsuffix: str = "left", rsuffix: str = "right") -> Iterator[gpd.GeoDataFrame]:
+        """Yield the join of each left chunk against the whole right layer"""
+        if how not in ("inner", "left"):
+            raise ValueError(f"Unsupported join type: {how}")
+        if predicate not in PREDICATES:
+            raise ValueError(f"Unsupported predicate: {predicate}")
+        if not isinstance(right, gpd.GeoDataFrame):
+            right = _concat_chunks(right)
+        right_geoms = np.asarray(right.geometry.values, dtype=object)
+        right_bounds = shapely.bounds(right_geoms)
+        right_valid = np.flatnonzero(np.isfinite(right_bounds).all(axis=1))
+
+        executor = None
+        try:
+            for left in left_chunks:
+                if right.crs is not None and left.crs is not None and right.crs != left.crs:
+                    right = reproject(right, left.crs)
+                    right_geoms = np.asarray(right.geometry.values, dtype=object)
+                    right_bounds = shapely.bounds(right_geoms)
+                parallel = (self.workers > 1 and
+                            len(left) + len(right) >= self.parallel_threshold)
+                if parallel and executor is None:
+                    executor = ProcessPoolExecutor(max_workers=self.workers)
+                left_pos, right_pos = self._join_pairs(left, right_geoms, right_bounds, right_valid,
+                                                       predicate, executor if parallel else None)
+                yield _build_result(left, right, left_pos, right_pos, how, lsuffix, rsuffix)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def _join_pairs(self, left: gpd.GeoDataFrame, right_geoms: np.ndarray, right_bounds: np.ndarray,
+                    right_valid: np.ndarray, predicate: str,
+                    executor: Optional[ProcessPoolExecutor]) -> Tuple[np.ndarray, np.ndarray]:
+        left_geoms = np.asarray(left.geometry.values, dtype=object)
+        left_bounds = shapely.bounds(left_geoms)
+        left_valid = np.flatnonzero(np.isfinite(left_bounds).all(axis=1))
+        if len(left_valid) == 0 or len(right_valid) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        cells_per_axis = math.ceil(math.sqrt(self.partitions)) if executor is not None else 1
+        x_edges, y_edges = _grid_edges(left_bounds[left_valid], cells_per_axis)
+        left_pos, left_cells = _assign_cells(left_bounds[left_valid], x_edges, y_edges)
+        right_pos, right_cells = _assign_cells(right_bounds[right_valid], x_edges, y_edges)
+        left_groups = _group_by_cell(left_valid[left_pos], left_cells)
+        right_groups = _group_by_cell(right_valid[right_pos], right_cells)
+
+        if executor is None:
+            join_cell = _join_cell
+        else:
+            join_cell = _join_cell_wkb
+            left_geoms, right_geoms = shapely.to_wkb(left_geoms), shapely.to_wkb(right_geoms)
+        tasks = [(cell, left_geoms[lp], lp, right_geoms[right_groups[cell]], right_groups[cell],
+                  predicate, x_edges, y_edges)
+                 for cell, lp in left_groups.items() if cell in right_groups]
+        if executor is None:
+            results = [join_cell(*task) for task in tasks]
+        else:
+            results = list(executor.map(join_cell, *zip(*tasks))) if tasks else []
+
+        if not results:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        left_pos = np.concatenate([r[0] for r in results])
+        right_pos = np.concatenate([r[1] for r in results])
+        # Same row order as gpd.sjoin: by left row, then right row
+        order = np.lexsort((right_pos, left_pos))
+        return left_pos[order], right_pos[order]
+
+
+def _concat_chunks(chunks: Iterable[gpd.GeoDataFrame]) -> gpd.GeoDataFrame:
+    chunks = list(chunks)
+    if not chunks:
+        raise ValueError("The right-hand input has no chunks")
+    return gpd.GeoDataFrame(pd.concat(chunks), crs=chunks[0].crs)
+
+
+def _build_result(left: gpd.GeoDataFrame, right: gpd.GeoDataFrame, left_pos: np.ndarray,
+                  right_pos: np.ndarray, how: str, lsuffix: str, rsuffix: str) -> gpd.GeoDataFrame:
+    """Assemble the joined frame in gpd.sjoin's layout (left index, index_right, right columns)"""
+    if how == "left":
+        unmatched = np.setdiff1d(np.arange(len(left)), left_pos)
+        left_pos = np.concatenate([left_pos, unmatched])
+        right_pos = np.concatenate([right_pos, np.full(len(unmatched), -1)])
+        order = np.argsort(left_pos, kind="stable")
+        left_pos, right_pos = left_pos[order], right_pos[order]
+
+    right_attributes = right.drop(columns=right.geometry.name)
+    overlap = set(left.columns) & set(right_attributes.columns)
+    left_part = left.iloc[left_pos].rename(columns={c: f"{c}_{lsuffix}" for c in overlap})
+    matched = right_pos >= 0
+    right_part = right_attributes.iloc[np.where(matched, right_pos, 0)].reset_index(drop=True)
+    right_part = right_part.rename(columns={c: f"{c}_{rsuffix}" for c in overlap})
+    right_part.insert(0, f"index_{rsuffix}", right.index[np.where(matched, right_pos, 0)])
+    if not matched.all():
+        right_part = right_part.where(pd.Series(matched))
+    right_part.index = left_part.index
+
+    return gpd.GeoDataFrame(pd.concat([left_part, right_part], axis=1),
+                            geometry=left.geometry.name, crs=left.crs)
+
+
+def spatial_join(left: FrameOrChunks, right: FrameOrChunks, how: str = "inner",
+                 predicate: str = "intersects", workers: Optional[int] = None) -> gpd.GeoDataFrame:
+    """Convenience function for a partitioned parallel spatial join"""
+    return PartitionedSpatialJoin(workers=workers).join(left, right, how, predicate)
@@ -0,0 +1,198 @@
+"""
+Tiled Parallel Overlay
+Path: E:\\GeoSpatial_Python\\GisProgramming\\src\\analysis\\tiled_overlay.py
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional, Tuple, Union
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+from .partitioned_join import _assign_cells, _concat_chunks, _grid_edges, _group_by_cell
+
+try:
+    from ..data_processing.reprojection import reproject
+except ImportError:
+    # Imported as a top-level package with src/ on sys.path (notebooks)
+    from data_processing.reprojection import reproject
+
+HOW = ("intersection", "union", "difference")
+
+FrameOrChunks = Union[gpd.GeoDataFrame, Iterable[gpd.GeoDataFrame]]
+
+
+def _clip(geometries: np.ndarray, ids: np.ndarray, tile: Tuple[float, float, float, float]) -> gpd.GeoDataFrame:
+    """Features cut to the tile rectangle, dropping pieces that vanish"""
+    clipped = shapely.clip_by_rect(geometries, *tile)
+    keep = ~shapely.is_empty(clipped) & (shapely.area(clipped) > 0)
+    return gpd.GeoDataFrame({"id": ids[keep]}, geometry=clipped[keep])
+
+
+def _overlay_tile(tile: Optional[Tuple[float, float, float, float]], left_wkb: np.ndarray,
+                  left_ids: np.ndarray, right_wkb: np.ndarray, right_ids: np.ndarray,
+                  how: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Overlay the parts of both layers inside one tile; runs in a worker process
+
+    Returns (left id, right id, WKB piece) triples, with -1 standing for
+    "no feature" on one side of a union or difference piece.
+    """
+    left_geoms, right_geoms = shapely.from_wkb(left_wkb), shapely.from_wkb(right_wkb)
+    if tile is None:
+        left = gpd.GeoDataFrame({"id": left_ids}, geometry=left_geoms)
+        right = gpd.GeoDataFrame({"id": right_ids}, geometry=right_geoms)
+    else:
+        left, right = _clip(left_geoms, left_ids, tile), _clip(right_geoms, right_ids, tile)
+
+    if len(left) and len(right):
+        pieces = gpd.overlay(left, right, how=how, keep_geom_type=True)
+        if how == "difference":
+            # Difference keeps only the left layer's columns
+            left_piece_ids = pieces["id"].to_numpy(dtype=np.int64)
+            right_piece_ids = np.full(len(pieces), -1)
+        else:
+            left_piece_ids = pieces["id_1"].fillna(-1).to_numpy(dtype=np.int64)
+            right_piece_ids = pieces["id_2"].fillna(-1).to_numpy(dtype=np.int64)
+        geometries = pieces.geometry.values
+    elif len(left) and how != "intersection":
+        left_piece_ids, right_piece_ids = left["id"].to_numpy(), np.full(len(left), -1)
+        geometries = left.geometry.values
+    elif len(right) and how == "union":
+        left_piece_ids, right_piece_ids = np.full(len(right), -1), right["id"].to_numpy()
+        geometries = right.geometry.values
+    else:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=object)
+    return left_piece_ids, right_piece_ids, shapely.to_wkb(np.asarray(geometries, dtype=object))
+
+
+def _stitch(left_ids: np.ndarray, right_ids: np.ndarray,
+            geometries: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Merge the per-tile pieces of each (left, right) pair back into one feature
+
+    Pieces of one pair come from different tiles, so they never overlap and
+    meet exactly along the tile edges, which a union dissolves without
+    leaving slivers. (A coverage union would be faster but rejects pieces
+    whose shared edge was noded differently on each side.)
+    """
+    # Pairs first, then left-only, then right-only pieces, as gpd.overlay orders them
+    kind = np.where(left_ids < 0, 2, np.where(right_ids < 0, 1, 0))
+    order = np.lexsort((right_ids, left_ids, kind))
+    left_ids, right_ids, geometries = left_ids[order], right_ids[order], geometries[order]
+    new_group = np.r_[True, (left_ids[1:] != left_ids[:-1]) | (right_ids[1:] != right_ids[:-1])]
+    starts = np.flatnonzero(new_group)
+    ends = np.r_[starts[1:], len(geometries)]
+
+    merged = geometries[starts].copy()
+    for i in np.flatnonzero(ends - starts > 1):
+        merged[i] = shapely.union_all(geometries[starts[i]:ends[i]])
+    return left_ids[starts], right_ids[starts], merged
+
+
+class TiledOverlay:
+    """Overlay that clips both layers to a grid of tiles and overlays tiles in parallel
+
+    Tile edges sit at quantiles of the feature centres so tiles carry
+    similar work. Each worker clips its share of both layers to its tile,
+    which also cuts very large polygons down to a manageable vertex count,
+    and runs gpd.overlay on the clipped parts. The pieces of each feature
+    pair are then stitched back together, so the result has the same rows
+    as gpd.overlay. Polygon layers only; inputs smaller than
+    parallel_threshold rows are overlaid in one piece.
+    """
+
+    def __init__(self, workers: Optional[int] = None, tiles: Optional[int] = None,
+                 parallel_threshold: int = 50_000):
+        self.workers = workers or os.cpu_count() or 1
+        self.tiles = tiles or self.workers * 4
+        self.parallel_threshold = parallel_threshold
+
+    def overlay(self, df1: FrameOrChunks, df2: FrameOrChunks, how: str = "intersection") -> gpd.GeoDataFrame:
+        """Overlay like gpd.overlay(df1, df2, how) for "intersection", "union" or "difference" """
+        if how not in HOW:
+            raise ValueError(f"Unsupported overlay: {how}")
+        df1 = df1 if isinstance(df1, gpd.GeoDataFrame) else _concat_chunks(df1)
+        df2 = df2 if isinstance(df2, gpd.GeoDataFrame) else _concat_chunks(df2)
+        for gdf in (df1, df2):
+            type_ids = shapely.get_type_id(np.asarray(gdf.geometry.values, dtype=object))
+            # -1 is a missing geometry, 3 and 6 are (Multi)Polygons
+            if not np.isin(type_ids, (-1, 3, 6)).all():
+                raise ValueError("Tiled overlay supports polygon layers only")
+        if df1.crs is not None and df2.crs is not None and df1.crs != df2.crs:
+            df2 = reproject(df2, df1.crs)
+
+        left_ids, right_ids, geometries = self._overlay_pieces(df1, df2, how)
+        left_ids, right_ids, geometries = _stitch(left_ids, right_ids, geometries)
+        return _build_result(df1, df2 if how != "difference" else None, left_ids, right_ids, geometries)
+
+    def _overlay_pieces(self, df1: gpd.GeoDataFrame, df2: gpd.GeoDataFrame,
+                        how: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        left_wkb = shapely.to_wkb(np.asarray(df1.geometry.values, dtype=object))
+        right_wkb = shapely.to_wkb(np.asarray(df2.geometry.values, dtype=object))
+        left_all, right_all = np.arange(len(df1)), np.arange(len(df2))
+
+        if self.workers == 1 or len(df1) + len(df2) < self.parallel_threshold:
+            left_ids, right_ids, pieces = _overlay_tile(None, left_wkb, left_all, right_wkb, right_all, how)
+            return left_ids, right_ids, shapely.from_wkb(pieces)
+
+        left_bounds, right_bounds = df1.geometry.bounds.to_numpy(), df2.geometry.bounds.to_numpy()
+        left_valid = np.flatnonzero(np.isfinite(left_bounds).all(axis=1))
+        right_valid = np.flatnonzero(np.isfinite(right_bounds).all(axis=1))
+        all_bounds = np.concatenate([left_bounds[left_valid], right_bounds[right_valid]])
+        x_edges, y_edges = _grid_edges(all_bounds, math.ceil(math.sqrt(self.tiles)))
+        minx, miny = np.min(all_bounds[:, :2], axis=0)
+        maxx, maxy = np.max(all_bounds[:, 2:], axis=0)
+        xs, ys = np.r_[minx, x_edges, maxx], np.r_[miny, y_edges, maxy]
+
+        left_pos, left_cells = _assign_cells(left_bounds[left_valid], x_edges, y_edges)
+        right_pos, right_cells = _assign_cells(right_bounds[right_valid], x_edges, y_edges)
+        left_groups = _group_by_cell(left_valid[left_pos], left_cells)
+        right_groups = _group_by_cell(right_valid[right_pos], right_cells)
+        empty = np.zeros(0, dtype=np.int64)
+
+        tasks = []
+        for cell in sorted(set(left_groups) | set(right_groups)):
+            lp, rp = left_groups.get(cell, empty), right_groups.get(cell, empty)
+            if how == "intersection" and (len(lp) == 0 or len(rp) == 0):
+                continue
+            if how == "difference" and len(lp) == 0:
+                continue
+            cx, cy = divmod(cell, len(y_edges) + 1)
+            tile = (xs[cx], ys[cy], xs[cx + 1], ys[cy + 1])
+            tasks.append((tile, left_wkb[lp], lp, right_wkb[rp], rp, how))
+
+        if not tasks:
+            return empty, empty, np.zeros(0, dtype=object)
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(_overlay_tile, *zip(*tasks)))
+        return (np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results]),
+                shapely.from_wkb(np.concatenate([r[2] for r in results])))
+
+
+def _build_result(df1: gpd.GeoDataFrame, df2: Optional[gpd.GeoDataFrame], left_ids: np.ndarray,
+                  right_ids: np.ndarray, geometries: np.ndarray) -> gpd.GeoDataFrame:
+    """Attach the layers' attributes to the stitched pieces, as gpd.overlay lays them out
+
+    df2 is None for a difference, whose result carries df1's columns only.
+    """
+    sources = [(df1.drop(columns=df1.geometry.name), left_ids, "_1")]
+    if df2 is not None:
+        sources.append((df2.drop(columns=df2.geometry.name), right_ids, "_2"))
+    overlap = set(sources[0][0].columns) & set(sources[-1][0].columns) if df2 is not None else set()
+    parts = []
+    for attributes, ids, suffix in sources:
+        part = attributes.iloc[np.where(ids >= 0, ids, 0)].reset_index(drop=True)
+        part = part.rename(columns={c: f"{c}{suffix}" for c in overlap})
+        if (ids < 0).any():
+            part = part.where(pd.Series(ids >= 0))
+        parts.append(part)
+    return gpd.GeoDataFrame(pd.concat(parts, axis=1), geometry=gpd.GeoSeries(geometries, crs=df1.crs))
+
+
+def overlay(df1: FrameOrChunks, df2: FrameOrChunks, how: str = "intersection",
+            workers: Optional[int] = None) -> gpd.GeoDataFrame:
+    """Convenience function for a tiled parallel overlay"""
+    return TiledOverlay(workers=workers).overlay(df1, df2, how)
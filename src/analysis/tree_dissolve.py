@@ -0,0 +1,126 @@
+"""
+Parallel Tree-Reduction Dissolve
+Path: E:\\GeoSpatial_Python\\GisProgramming\\src\\analysis\\tree_dissolve.py
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Union
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+try:
+    from ..data_processing.spatial_index import hilbert_order
+except ImportError:
+    # Imported as a top-level package with src/ on sys.path (notebooks)
+    from data_processing.spatial_index import hilbert_order
+
+
+def _object_array(items: list) -> np.ndarray:
+    """1-D object array that numpy will not try to unpack the items of"""
+    array = np.empty(len(items), dtype=object)
+    array[:] = items
+    return array
+
+
+def _union_wkb(wkb: np.ndarray) -> bytes:
+    """Worker entry point: union one batch, WKB in and out"""
+    return shapely.to_wkb(shapely.union_all(shapely.from_wkb(wkb)))
+
+
+class ParallelDissolve:
+    """Dissolve that unions each group in a balanced tree of small batches
+
+    Instead of one giant union per group, geometries are unioned batch_size
+    at a time, then the results of those batches, and so on until one
+    geometry per group is left. Every level's batches, across all groups,
+    run in a process pool. With spatial_sort the geometries are first
+    ordered along a Hilbert curve, so each batch holds neighbours that
+    merge into compact shapes early. Attributes are aggregated separately
+    with a vectorized pandas groupby.
+    """
+
+    def __init__(self, workers: Optional[int] = None, batch_size: int = 16,
+                 spatial_sort: bool = True, parallel_threshold: int = 50_000):
+        if batch_size < 2:
+            raise ValueError("batch_size must be at least 2")
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.spatial_sort = spatial_sort
+        self.parallel_threshold = parallel_threshold
+
+    def dissolve(self, gdf: gpd.GeoDataFrame, by: Optional[Union[str, List[str]]] = None,
+                 aggfunc="first", as_index: bool = True, dropna: bool = True) -> gpd.GeoDataFrame:
+        """Dissolve like GeoDataFrame.dissolve(by, aggfunc, as_index, dropna)"""
+        geometry_name = gdf.geometry.name
+        attributes = gdf.drop(columns=geometry_name)
+        if by is None:
+            # One group holding every row, as GeoDataFrame.dissolve does
+            by = np.zeros(len(gdf), dtype=np.int64)
+        grouped = attributes.groupby(by, sort=True, dropna=dropna)
+        codes = grouped.ngroup().to_numpy()
+        aggregated = grouped.agg(aggfunc)
+
+        geometries = np.asarray(gdf.geometry.values, dtype=object)
+        keep = ~pd.isna(codes)
+        codes, geometries = codes[keep].astype(np.int64), geometries[keep]
+        if self.spatial_sort and len(geometries):
+            order = hilbert_order(shapely.bounds(geometries))
+            codes, geometries = codes[order], geometries[order]
+        # Stable sort keeps the Hilbert order inside each group
+        order = np.argsort(codes, kind="stable")
+        codes, geometries = codes[order], geometries[order]
+
+        unions = self._reduce(codes, geometries, len(aggregated))
+        result = gpd.GeoDataFrame(aggregated, geometry=gpd.GeoSeries(unions, index=aggregated.index),
+                                  crs=gdf.crs)
+        result = result.rename_geometry(geometry_name) if geometry_name != "geometry" else result
+        result = result[[geometry_name] + [c for c in result.columns if c != geometry_name]]
+        return result if as_index else result.reset_index()
+
+    def _reduce(self, codes: np.ndarray, geometries: np.ndarray, group_count: int) -> np.ndarray:
+        """One unioned geometry per group code, reduced level by level"""
+        starts = np.searchsorted(codes, np.arange(group_count), side="left")
+        ends = np.searchsorted(codes, np.arange(group_count), side="right")
+        parallel = self.workers > 1 and len(geometries) >= self.parallel_threshold
+        if parallel:
+            geometries = shapely.to_wkb(geometries)
+        pieces = [geometries[start:end] for start, end in zip(starts, ends)]
+
+        executor = ProcessPoolExecutor(max_workers=self.workers) if parallel else None
+        try:
+            while True:
+                owners, batches = [], []
+                for group, group_pieces in enumerate(pieces):
+                    if len(group_pieces) > 1:
+                        for start in range(0, len(group_pieces), self.batch_size):
+                            owners.append(group)
+                            batches.append(group_pieces[start:start + self.batch_size])
+                if not batches:
+                    break
+                if executor is None:
+                    results = [shapely.union_all(batch) for batch in batches]
+                else:
+                    results = list(executor.map(_union_wkb, batches,
+                                                chunksize=max(1, len(batches) // (self.workers * 4))))
+                merged = [[] for _ in pieces]
+                for group, result in zip(owners, results):
+                    merged[group].append(result)
+                for group, results in enumerate(merged):
+                    if results:
+                        pieces[group] = _object_array(results)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        unions = _object_array([group_pieces[0] if len(group_pieces) else None for group_pieces in pieces])
+        return shapely.from_wkb(unions) if parallel else unions
+
+
+def dissolve(gdf: gpd.GeoDataFrame, by: Optional[Union[str, List[str]]] = None, aggfunc="first",
+             workers: Optional[int] = None, as_index: bool = True) -> gpd.GeoDataFrame:
+    """Convenience function for a parallel tree-reduction dissolve"""
+    return ParallelDissolve(workers=workers).dissolve(gdf, by, aggfunc, as_index)
@@ -18,6 +18,12 @@ class Config:
     PROCESSED_DATA_DIR = DATA_DIR / "processed"
     EXTERNAL_DATA_DIR = DATA_DIR / "external"
     
+    # Cache directories
+    CACHE_DIR = PROCESSED_DATA_DIR / "cache"
+    VECTOR_CACHE_DIR = CACHE_DIR / "vector"
+    VECTOR_CACHE_MAX_BYTES = 2 * 1024 ** 3
+    CATALOG_PATH = CACHE_DIR / "vector_catalog.sqlite"
+    
     # Vector data directories
     VECTOR_DIR = RAW_DATA_DIR / "vector"
     SHAPEFILES_DIR = VECTOR_DIR / "shapefiles"
@@ -57,6 +63,7 @@ class Config:
         """Create all directories if they don't exist"""
         directories = [
             cls.DATA_DIR, cls.RAW_DATA_DIR, cls.PROCESSED_DATA_DIR, cls.EXTERNAL_DATA_DIR,
+            cls.CACHE_DIR, cls.VECTOR_CACHE_DIR,
             cls.VECTOR_DIR, cls.SHAPEFILES_DIR, cls.GEOJSON_DIR, cls.VECTOR_OTHER_DIR,
             cls.RASTER_DIR, cls.TIFF_DIR, cls.IMAGERY_DIR, cls.RASTER_OTHER_DIR,
             cls.NOTEBOOKS_DIR, cls.EXPLORATORY_DIR, cls.ANALYSIS_DIR, cls.VISUALIZATION_DIR,
@@ -1,2 +1,30 @@
-"""Data Processing Module"""
-from .vector_utils import VectorDataProcessor, load_vector_data
\ No newline at end of file
+"""Data Processing Module
+
+Submodules pull in geopandas, pandas and pyogrio, so they are imported on
+first attribute access rather than when the package is imported.
+"""
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    "VectorDataProcessor": ".vector_utils",
+    "load_vector_data": ".vector_utils",
+    "compact_dtypes": ".dtypes",
+    "arrow_to_geodataframe": ".arrow_io",
+    "Reprojector": ".reprojection",
+    "reproject": ".reprojection",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
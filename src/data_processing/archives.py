@@ -0,0 +1,109 @@
+"""
+Reading Vector Layers Inside Archives
+Path: E:\\GeoSpatial_Python\\GisProgramming\\src\\data_processing\\archives.py
+"""
+
+import os
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
+from typing import List, Optional, Tuple, Union
+
+# GDAL virtual file systems stream members without extracting them to disk
+ARCHIVE_PREFIXES = {".zip": "/vsizip/", ".gz": "/vsigzip/", ".7z": "/vsi7z/"}
+
+MEMBER_EXTENSIONS = {".shp", ".geojson", ".json", ".gpkg", ".fgb", ".kml", ".gml"}
+
+
+def split_archive_path(path: Union[str, Path]) -> Tuple[Optional[Path], Optional[str]]:
+    """Split .../delivery.zip/roads/roads.shp into (archive path, member)
+
+    Returns (None, None) for paths that do not go through an archive, and
+    (archive, None) for a bare archive path.
+    """
+    path = Path(path)
+    parts = path.parts
+    for i, part in enumerate(parts):
+        if Path(part).suffix.lower() in ARCHIVE_PREFIXES:
+            archive = Path(*parts[:i + 1])
+            member = "/".join(parts[i + 1:]) or None
+            return archive, member
+    return None, None
+
+
+def source_file(path: Union[str, Path]) -> Path:
+    """The real file on disk behind path (the archive for archive members)"""
+    archive, _ = split_archive_path(path)
+    return archive if archive is not None else Path(path)
+
+
+def source_stat(path: Union[str, Path]) -> os.stat_result:
+    """stat() of the file on disk behind path"""
+    return source_file(path).stat()
+
+
+@lru_cache(maxsize=256)
+def _cached_members(archive: str, size: int, mtime_ns: int) -> Tuple[str, ...]:
+    # size and mtime are part of the cache key so edited archives are re-listed
+    suffix = Path(archive).suffix.lower()
+    if suffix == ".zip":
+        import zipfile
+
+        with zipfile.ZipFile(archive) as zf:
+            names = zf.namelist()
+    elif suffix == ".gz":
+        names = [Path(archive).stem]
+    elif suffix == ".7z":
+        try:
+            import py7zr
+        except ImportError as e:
+            raise ImportError("Listing .7z archives requires the py7zr package") from e
+        with py7zr.SevenZipFile(archive) as zf:
+            names = zf.getnames()
+    else:
+        raise ValueError(f"Not a supported archive: {archive}")
+
+    return tuple(sorted(name for name in names
+                        if PurePosixPath(name).suffix.lower() in MEMBER_EXTENSIONS))
+
+
+def list_archive_members(archive: Union[str, Path]) -> List[str]:
+    """Vector members of an archive; listings are cached per archive version"""
+    stat = Path(archive).stat()
+    return list(_cached_members(str(archive), stat.st_size, stat.st_mtime_ns))
+
+
+def to_vsi_path(path: Union[str, Path]) -> Union[str, Path]:
+    """GDAL virtual path for an archive member; other paths are returned unchanged
+
+    A bare archive path resolves to its only vector member and raises
+    ValueError if the archive holds several.
+    """
+    archive, member = split_archive_path(path)
+    if archive is None:
+        return path
+    if not archive.exists():
+        raise FileNotFoundError(f"Archive not found: {archive}")
+
+    suffix = archive.suffix.lower()
+    if suffix == ".gz":
+        return f"/vsigzip/{archive.as_posix()}"
+    if member is None:
+        members = list_archive_members(archive)
+        if len(members) != 1:
+            raise ValueError(f"{archive.name} holds {len(members)} vector layers; "
+                             f"name one of them: {members}")
+        member = members[0]
+    return f"{ARCHIVE_PREFIXES[suffix]}{archive.as_posix()}/{member}"
+
+
+def archive_member_exists(path: Union[str, Path]) -> bool:
+    """Whether path names an existing archive (and member, if one is given)"""
+    archive, member = split_archive_path(path)
+    if archive is None or not archive.is_file():
+        return False
+    if member is None:
+        return True
+    try:
+        return member in list_archive_members(archive)
+    except Exception:
+        return False
@@ -0,0 +1,128 @@
+"""
+Arrow-Native Vector Reading
+Path: E:\\GeoSpatial_Python\\GisProgramming\\src\\data_processing\\arrow_io.py
+"""
+
+import json
+from pathlib import Path
+from typing import Optional
+
+import geopandas as gpd
+
+from .archives import to_vsi_path
+
+
+def _rows_to_feature_window(rows) -> dict:
+    """Translate a rows option (int or slice) into GDAL's skip/max features"""
+    if rows is None:
+        return {}
+    if isinstance(rows, int):
+        return {"max_features": rows}
+    if rows.step not in (None, 1):
+        raise ValueError("rows slices with a step are not supported for Arrow reads")
+    start = rows.start or 0
+    window = {"skip_features": start}
+    if rows.stop is not None:
+        window["max_features"] = max(rows.stop - start, 0)
+    return window
+
+
+def read_vector_arrow(file_path: Path, read_options: Optional[dict] = None):
+    """Read a vector file straight into a pyarrow Table through GDAL's Arrow stream
+
+    The geometry column holds WKB tagged as geoarrow.wkb (with the CRS in its
+    extension metadata); no shapely objects are created.
+    """
+    import pyogrio
+
+    options = dict(read_options or {})
+    options.update(_rows_to_feature_window(options.pop("rows", None)))
+    meta, table = pyogrio.read_arrow(to_vsi_path(file_path), **options)
+    return normalize_arrow_table(table, meta["geometry_name"] or "wkb_geometry")
+
+
+def read_geoparquet_arrow(file_path: Path):
+    """Read a GeoParquet file memory-mapped, tagging its geometry as geoarrow.wkb"""
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(file_path, memory_map=True)
+    geo = json.loads((table.schema.metadata or {}).get(b"geo", b"{}"))
+    return normalize_arrow_table(tag_geoparquet_geometry(table), geo.get("primary_column", "geometry"))
+
+
+def normalize_arrow_table(table, geometry_name: str):
+    """Give Arrow reads one schema whatever their source
+
+    The geometry column is renamed to "geometry" (as in load_vector_data),
+    large string/binary attributes become plain string/binary, the CRS in
+    the extension metadata is re-serialised through pyproj and schema-level
+    metadata (pandas and GeoParquet bookkeeping) is dropped, so a GDAL read
+    and a cached GeoParquet read of the same file compare equal.
+    """
+    import pyarrow as pa
+    from pyproj import CRS
+
+    fields = []
+    columns = []
+    for field, column in zip(table.schema, table.columns):
+        name = "geometry" if field.name == geometry_name else field.name
+        if pa.types.is_large_string(field.type):
+            field, column = field.with_type(pa.string()), column.cast(pa.string())
+        elif pa.types.is_large_binary(field.type):
+            field, column = field.with_type(pa.binary()), column.cast(pa.binary())
+        metadata = field.metadata
+        if metadata and b"ARROW:extension:metadata" in metadata:
+            metadata = dict(metadata)
+            extension = json.loads(metadata[b"ARROW:extension:metadata"])
+            if extension.get("crs") is not None:
+                # GDAL and pyproj write differently detailed PROJJSON for the same CRS
+                extension["crs"] = CRS.from_user_input(extension["crs"]).to_json_dict()
+            metadata[b"ARROW:extension:metadata"] = json.dumps(extension, separators=(",", ":")).encode()
+        fields.append(field.with_name(name).with_metadata(metadata))
+        columns.append(column)
+    return pa.Table.from_arrays(columns, schema=pa.schema(fields))
+
+
+def tag_geoparquet_geometry(table):
+    """Mark a GeoParquet table's WKB geometry columns as geoarrow.wkb
+
+    GeoParquet keeps the CRS in the file-level "geo" metadata; GeoArrow
+    consumers (and GeoDataFrame.from_arrow) expect it on the field instead.
+    """
+    metadata = table.schema.metadata or {}
+    if b"geo" not in metadata:
+        return table
+
+    geo = json.loads(metadata[b"geo"])
+    for name, column in geo.get("columns", {}).items():
+        if column.get("encoding", "WKB").upper() != "WKB" or name not in table.column_names:
+            continue
+        index = table.schema.get_field_index(name)
+        # A missing "crs" key means OGC:CRS84 in GeoParquet
+        extension = {"crs": column.get("crs", "OGC:CRS84")}
+        field = table.schema.field(index).with_metadata({
+            b"ARROW:extension:name": b"geoarrow.wkb",
+            b"ARROW:extension:metadata": json.dumps(extension).encode(),
+        })
+        table = table.set_column(index, field, table.column(index))
+    return table
+
+
+def to_geoarrow_native(table):
+    """Convert geoarrow.wkb geometry columns to GeoArrow's native coordinate layout
+
+    GeoArrow native arrays are built by shapely's vectorised ragged-array
+    export, so this step does materialise geometries once.
+    """
+    import pyarrow as pa
+
+    gdf = arrow_to_geodataframe(table)
+    return pa.table(gdf.to_arrow(geometry_encoding="geoarrow", index=False))
+
+
+def arrow_to_geodataframe(table) -> gpd.GeoDataFrame:
+    """Build a GeoDataFrame from an Arrow table with geoarrow geometry columns
+
+    Geometries are decoded from WKB in one vectorised call.
+    """
+    return gpd.GeoDataFrame.from_arrow(table)
@@ -0,0 +1,63 @@
+"""
+Asyncio Support for Vector I/O
+Path: E:\\GeoSpatial_Python\\GisProgramming\\src\\data_processing\\async_io.py
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Hashable, Optional
+
+import geopandas as gpd
+
+from .cache import private_view
+
+
+class AsyncRunner:
+    """Runs blocking I/O on a bounded thread pool and coalesces duplicate calls
+
+    Concurrent calls with the same key share one underlying read; each caller
+    gets its own view of the result. Cancelling a caller only detaches that
+    caller. The shared read is cancelled once every caller has gone, if it
+    has not started yet (a read already running in a thread completes and its
+    result is discarded).
+    """
+
+    def __init__(self, max_workers: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="vector-io")
+        self._inflight = {}
+
+    async def run(self, key: Optional[Hashable], func: Callable, *args, **kwargs) -> Any:
+        """Await func(*args, **kwargs) on the pool; calls sharing a key run once"""
+        loop = asyncio.get_running_loop()
+        call = partial(func, *args, **kwargs)
+        if key is None:
+            return await loop.run_in_executor(self._executor, call)
+
+        entry = self._inflight.get(key)
+        if entry is None:
+            future = loop.run_in_executor(self._executor, call)
+            entry = self._inflight[key] = {"future": future, "waiters": 0}
+            future.add_done_callback(partial(self._forget, key, future))
+        entry["waiters"] += 1
+
+        try:
+            result = await asyncio.shield(entry["future"])
+        except asyncio.CancelledError:
+            entry["waiters"] -= 1
+            if entry["waiters"] == 0:
+                entry["future"].cancel()
+                self._forget(key, entry["future"])
+            raise
+        entry["waiters"] -= 1
+        return private_view(result) if isinstance(result, gpd.GeoDataFrame) else result
+
+    def _forget(self, key: Hashable, future: asyncio.Future, *_) -> None:
+        # Later calls start a fresh read; the loaders' caches serve repeats
+        entry = self._inflight.get(key)
+        if entry is not None and entry["future"] is future:
+            del self._inflight[key]
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
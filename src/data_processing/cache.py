@@ -0,0 +1,234 @@
+"""
+On-disk and in-memory caches for parsed vector files
+Path: E:\\GeoSpatial_Python\\GisProgramming\\src\\data_processing\\cache.py
+"""
+
+import hashlib
+import os
+import threading
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+from .archives import source_stat
+
+
+def cache_key(file_path: Path, read_options: Optional[dict] = None) -> str:
+    """Key identifying one version of a source file read with given options
+
+    The part before the dash depends only on the resolved path; the part
+    after it covers size, mtime and the read options.
+    """
+    stat = source_stat(file_path)
+    version = f"{stat.st_size}:{stat.st_mtime_ns}:{options_fingerprint(read_options)}"
+    return f"{_source_hash(file_path)}-{hashlib.sha1(version.encode()).hexdigest()[:16]}"
+
+
+def options_fingerprint(read_options: Optional[dict] = None) -> str:
+    """Stable text form of read options, usable as part of a key"""
+    options = []
+    for name, value in sorted((read_options or {}).items()):
+        # Geometries (mask) hash by their WKB rather than their repr
+        value = value.wkb_hex if hasattr(value, "wkb_hex") else repr(value)
+        options.append(f"{name}={value}")
+    return "&".join(options)
+
+
+def _source_hash(file_path: Path) -> str:
+    return hashlib.sha1(str(Path(file_path).resolve()).encode()).hexdigest()[:16]
+
+
+def estimate_nbytes(gdf: pd.DataFrame) -> int:
+    """Approximate in-memory size of a (Geo)DataFrame, geometries included"""
+    nbytes = 0
+    for name in gdf.columns:
+        column = gdf[name]
+        if isinstance(column.dtype, gpd.array.GeometryDtype):
+            # Coordinates are 16 bytes per XY pair plus ~100 bytes of GEOS and
+            # Python overhead per geometry object
+            values = np.asarray(column.values)
+            nbytes += int(shapely.get_num_coordinates(values).sum()) * 16 + len(values) * 100
+        else:
+            nbytes += int(column.memory_usage(deep=True, index=False))
+    return nbytes + int(gdf.index.memory_usage(deep=True))
+
+
+def private_view(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """A frame the caller may modify without affecting gdf
+
+    A cheap shallow copy under pandas copy-on-write, a deep copy otherwise.
+    """
+    copy_on_write = getattr(pd.options.mode, "copy_on_write", False)
+    if copy_on_write is True or int(pd.__version__.split(".")[0]) >= 3:
+        return gdf.copy(deep=False)
+    return gdf.copy(deep=True)
+
+
+class ParquetCache:
+    """Columnar copies of parsed vector files, evicted least-recently-used
+
+    Entries are named <source hash>-<version hash>.parquet. The source hash
+    depends only on the resolved source path, so every cached variant of a
+    file can be dropped at once; the version hash covers size, mtime and the
+    read options, so edited sources simply stop matching.
+    """
+
+    SUFFIX = ".parquet"
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def key(self, file_path: Path, read_options: Optional[dict] = None) -> str:
+        """Cache key for a source file read with the given options"""
+        return cache_key(file_path, read_options)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.SUFFIX}"
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """Path of the cached GeoParquet file for key, or None on a miss"""
+        entry = self._entry_path(key)
+        if not entry.exists():
+            return None
+        try:
+            os.utime(entry)
+        except FileNotFoundError:
+            return None
+        return entry
+
+    def get(self, key: str) -> Optional[gpd.GeoDataFrame]:
+        """Return the cached frame for key, or None on a miss"""
+        entry = self._entry_path(key)
+        try:
+            gdf = gpd.read_parquet(entry)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            warnings.warn(f"Discarding unreadable cache entry {entry.name}: {e}")
+            entry.unlink(missing_ok=True)
+            return None
+
+        # The entry's mtime doubles as its LRU timestamp
+        try:
+            os.utime(entry)
+        except FileNotFoundError:
+            pass
+        return gdf
+
+    def put(self, key: str, gdf: gpd.GeoDataFrame) -> Optional[Path]:
+        """Store gdf under key, then evict old entries beyond the size cap"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = self._entry_path(key)
+        tmp_path = entry.with_name(f".{entry.name}.{os.getpid()}.tmp")
+        try:
+            gdf.to_parquet(tmp_path)
+            os.replace(tmp_path, entry)
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            warnings.warn(f"Could not cache {key}: {e}")
+            return None
+
+        self.evict()
+        return entry
+
+    def evict(self) -> int:
+        """Delete least-recently-used entries until the cache fits max_bytes"""
+        entries = []
+        for entry in self.cache_dir.glob(f"*{self.SUFFIX}"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def invalidate(self, file_path: Optional[Path] = None) -> int:
+        """Remove cached entries for one source file, or all entries if None"""
+        pattern = f"{_source_hash(file_path)}-*" if file_path else "*"
+        removed = 0
+        for entry in self.cache_dir.glob(f"{pattern}{self.SUFFIX}"):
+            entry.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+
+class MemoryCache:
+    """In-process LRU cache of loaded frames bounded by estimated bytes
+
+    Callers always receive a new frame object. With pandas copy-on-write
+    that is a cheap shallow copy; otherwise the attribute data is copied so
+    in-place edits by the caller can never reach the cached frame.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[gpd.GeoDataFrame]:
+        """Return a private view of the cached frame for key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return private_view(entry[0])
+
+    def put(self, key: str, gdf: gpd.GeoDataFrame) -> None:
+        """Store a private copy of gdf, evicting least-recently-used frames"""
+        nbytes = estimate_nbytes(gdf)
+        if nbytes > self.max_bytes:
+            return
+        gdf = private_view(gdf)
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (gdf, nbytes)
+            self.current_bytes += nbytes
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_bytes
+                self.evictions += 1
+
+    def invalidate(self, file_path: Optional[Path] = None) -> int:
+        """Drop frames for one source file, or every frame if None"""
+        prefix = f"{_source_hash(file_path)}-" if file_path else ""
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                self.current_bytes -= self._entries.pop(key)[1]
+        return len(keys)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current usage"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "current_bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
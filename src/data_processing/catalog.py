@@ -0,0 +1,285 @@
+"""
+Persistent Vector Metadata Catalog
+Path: E:\\GeoSpatial_Python\\GisProgramming\\src\\data_processing\\catalog.py
+"""
+
+import json
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from .archives import ARCHIVE_PREFIXES, MEMBER_EXTENSIONS, list_archive_members, to_vsi_path
+
+VECTOR_EXTENSIONS = {".shp", ".geojson", ".json", ".gpkg", ".fgb", ".kml", ".gml", ".parquet"}
+
+# Bump when the tables change; the catalog is rebuilt from scratch on mismatch
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS layers (
+    file TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    layer TEXT NOT NULL,
+    name TEXT NOT NULL,
+    directory TEXT NOT NULL,
+    driver TEXT,
+    crs TEXT,
+    geometry_type TEXT,
+    feature_count INTEGER,
+    minx REAL, miny REAL, maxx REAL, maxy REAL,
+    minx_4326 REAL, miny_4326 REAL, maxx_4326 REAL, maxy_4326 REAL,
+    fields TEXT,
+    PRIMARY KEY (path, layer)
+);
+CREATE INDEX IF NOT EXISTS layers_name ON layers(name);
+CREATE INDEX IF NOT EXISTS layers_bbox_4326 ON layers(minx_4326, maxx_4326, miny_4326, maxy_4326);
+"""
+
+
+def _bounds_4326(crs: Optional[str], bounds: Optional[tuple]) -> tuple:
+    """Reproject a bounding box to EPSG:4326, densifying its edges"""
+    if crs is None or bounds is None:
+        return (None, None, None, None)
+    from pyproj import Transformer
+
+    transformer = Transformer.from_crs(crs, "EPSG:4326", always_xy=True)
+    return transformer.transform_bounds(*bounds, densify_pts=21)
+
+
+def read_layer_metadata(path: Path) -> List[dict]:
+    """Header-level metadata for every layer of a vector file
+
+    Feature counts and bounds are only filled in when the driver can report
+    them without scanning the features; otherwise they are None. path may
+    point inside an archive (.../delivery.zip/roads.shp).
+    """
+    if path.suffix.lower() == ".parquet":
+        return [_read_parquet_metadata(path)]
+
+    import pyogrio
+
+    source = to_vsi_path(path)
+    records = []
+    for layer, _ in pyogrio.list_layers(source):
+        info = pyogrio.read_info(source, layer=layer)
+        count = info.get("features")
+        bounds = info.get("total_bounds")
+        bounds = tuple(bounds) if bounds is not None else None
+        records.append({
+            "layer": layer,
+            "driver": info.get("driver"),
+            "crs": info.get("crs"),
+            "geometry_type": info.get("geometry_type"),
+            "feature_count": count if count is not None and count >= 0 else None,
+            "bounds": bounds,
+            "fields": dict(zip(info["fields"].tolist(), info["dtypes"].tolist())),
+        })
+    return records
+
+
+def _read_parquet_metadata(path: Path) -> dict:
+    """GeoParquet metadata from the file footer"""
+    import pyarrow.parquet as pq
+    from pyproj import CRS
+
+    parquet_file = pq.ParquetFile(path)
+    metadata = parquet_file.schema_arrow.metadata or {}
+    geo = json.loads(metadata.get(b"geo", b"{}"))
+    column = geo.get("columns", {}).get(geo.get("primary_column"), {})
+    # GeoParquet: a missing "crs" key means OGC:CRS84, an explicit null means unknown
+    crs = column.get("crs", "OGC:CRS84") if column else None
+    crs = CRS.from_user_input(crs).to_string() if crs else None
+    bbox = column.get("bbox")
+    geometry_types = column.get("geometry_types") or []
+    return {
+        "layer": path.stem,
+        "driver": "Parquet",
+        "crs": crs,
+        "geometry_type": geometry_types[0] if len(geometry_types) == 1 else None,
+        "feature_count": parquet_file.metadata.num_rows,
+        "bounds": tuple(bbox) if bbox else None,
+        "fields": {field.name: str(field.type) for field in parquet_file.schema_arrow},
+    }
+
+
+def _is_catalogued(path: Path) -> bool:
+    """Vector files, plus archives that may contain them (x.zip, x.7z, x.geojson.gz)"""
+    suffix = path.suffix.lower()
+    if suffix == ".gz":
+        return Path(path.stem).suffix.lower() in MEMBER_EXTENSIONS
+    return suffix in VECTOR_EXTENSIONS or suffix in ARCHIVE_PREFIXES
+
+
+class VectorCatalog:
+    """SQLite catalog of the vector layers found under a set of directories
+
+    refresh() only re-reads files whose size or mtime changed since the last
+    refresh and drops files that disappeared. Metadata comes from file headers
+    and footers, never from reading the features themselves. The set of
+    catalogued paths is also kept in memory, loaded on first use and rebuilt
+    by refresh(), so resolve() touches neither SQLite nor the filesystem.
+    """
+
+    def __init__(self, db_path: Path, roots: Iterable[Path], exclude: Iterable[Path] = ()):
+        self.db_path = Path(db_path)
+        self.roots = [Path(root) for root in roots]
+        self.exclude = [Path(path) for path in exclude]
+        self._paths = None
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                conn.executescript("DROP TABLE IF EXISTS layers; DROP TABLE IF EXISTS files;")
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def _scan(self) -> dict:
+        """Map of path -> stat for every vector file under the roots"""
+        found = {}
+        for root in self.roots:
+            if not root.exists():
+                continue
+            for dirpath, dirnames, filenames in os.walk(root):
+                current = Path(dirpath)
+                # Skip excluded trees (e.g. caches) and hidden temporary outputs
+                dirnames[:] = [d for d in dirnames
+                               if not d.startswith(".") and current / d not in self.exclude]
+                for name in filenames:
+                    path = current / name
+                    if name.startswith(".") or not _is_catalogued(path):
+                        continue
+                    found[str(path)] = path.stat()
+        return found
+
+    def refresh(self) -> dict:
+        """Bring the catalog up to date; returns counts of added/updated/removed files"""
+        found = self._scan()
+        counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+
+        with closing(self._connect()) as conn, conn:
+            known = {row["path"]: (row["size"], row["mtime_ns"])
+                     for row in conn.execute("SELECT path, size, mtime_ns FROM files")}
+
+            for path in set(known) - set(found):
+                conn.execute("DELETE FROM files WHERE path = ?", (path,))
+                counts["removed"] += 1
+
+            for path, stat in found.items():
+                if known.get(path) == (stat.st_size, stat.st_mtime_ns):
+                    counts["unchanged"] += 1
+                    continue
+                counts["updated" if path in known else "added"] += 1
+                self._index_file(conn, Path(path), stat)
+
+        self._paths = self._load_paths()
+        return counts
+
+    def _load_paths(self) -> frozenset:
+        """Every catalogued file and archive member path"""
+        with closing(self._connect()) as conn:
+            return frozenset(row["path"] for row in conn.execute(
+                "SELECT path FROM files UNION SELECT path FROM layers"))
+
+    def _index_file(self, conn: sqlite3.Connection, path: Path, stat: os.stat_result) -> None:
+        conn.execute("DELETE FROM files WHERE path = ?", (str(path),))
+        records = []
+        errors = []
+        # Archives contribute one entry per vector member, addressed as archive/member
+        members = [path]
+        if path.suffix.lower() in ARCHIVE_PREFIXES:
+            try:
+                members = [path / member for member in list_archive_members(path)]
+            except Exception as e:
+                # Unreadable archives (corrupt, or .7z without py7zr) are recorded, not fatal
+                members = []
+                errors.append(f"{path.name}: {type(e).__name__}: {e}")
+        for member in members:
+            try:
+                records.extend((member, record) for record in read_layer_metadata(member))
+            except Exception as e:
+                errors.append(f"{member.name}: {type(e).__name__}: {e}")
+
+        conn.execute("INSERT INTO files (path, size, mtime_ns, error) VALUES (?, ?, ?, ?)",
+                     (str(path), stat.st_size, stat.st_mtime_ns, "; ".join(errors) or None))
+        for member, record in records:
+            bounds = record["bounds"] or (None, None, None, None)
+            try:
+                bounds_4326 = _bounds_4326(record["crs"], record["bounds"])
+            except Exception:
+                bounds_4326 = (None, None, None, None)
+            conn.execute(
+                "INSERT INTO layers VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (str(path), str(member), record["layer"], member.name, str(path.parent), record["driver"],
+                 record["crs"], record["geometry_type"], record["feature_count"],
+                 *bounds, *bounds_4326, json.dumps(record["fields"]))
+            )
+
+    def layers(self, directory: Optional[Path] = None, name: Optional[str] = None,
+               bbox: Optional[tuple] = None, crs: str = "EPSG:4326",
+               geometry_type: Optional[str] = None) -> List[dict]:
+        """Query catalogued layers
+
+        bbox is (minx, miny, maxx, maxy) in crs; layers whose extent is
+        unknown never match a bbox query.
+        """
+        clauses = []
+        params = []
+        if directory is not None:
+            clauses.append("directory = ?")
+            params.append(str(directory))
+        if name is not None:
+            clauses.append("name = ?")
+            params.append(name)
+        if geometry_type is not None:
+            clauses.append("geometry_type = ?")
+            params.append(geometry_type)
+        if bbox is not None:
+            if crs not in ("EPSG:4326", "epsg:4326", 4326):
+                bbox = _bounds_4326(crs, bbox)
+            clauses.append("minx_4326 <= ? AND maxx_4326 >= ? AND miny_4326 <= ? AND maxy_4326 >= ?")
+            params.extend([bbox[2], bbox[0], bbox[3], bbox[1]])
+
+        query = "SELECT * FROM layers"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY path, layer"
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        results = []
+        for row in rows:
+            record = dict(row)
+            record["path"] = Path(record["path"])
+            record["file"] = Path(record["file"])
+            record["fields"] = json.loads(record["fields"])
+            results.append(record)
+        return results
+
+    def errors(self) -> dict:
+        """Files that could not be read during the last refresh, with their errors"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT path, error FROM files WHERE error IS NOT NULL").fetchall()
+        return {Path(row["path"]): row["error"] for row in rows}
+
+    def resolve(self, candidates: List[Path]) -> Optional[Path]:
+        """First of the candidate paths that is catalogued, in the given order"""
+        if self._paths is None:
+            self._paths = self._load_paths()
+        for path in candidates:
+            if str(path) in self._paths:
+                return path
+        return None
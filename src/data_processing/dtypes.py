@@ -0,0 +1,96 @@
+"""
+Compact Dtype Conversion for Attribute Tables
+Path: E:\\GeoSpatial_Python\\GisProgramming\\src\\data_processing\\dtypes.py
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import (is_bool_dtype, is_float_dtype, is_integer_dtype,
+                              is_object_dtype, is_string_dtype)
+
+
+def _arrow_string_dtype():
+    """Arrow-backed string dtype, or None when pyarrow is not installed"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    return pd.StringDtype("pyarrow")
+
+
+def _compact_column(column: pd.Series, category_threshold: float, arrow_strings: bool,
+                    unsigned: bool) -> pd.Series:
+    """Smallest lossless representation of one attribute column"""
+    if is_bool_dtype(column.dtype) or isinstance(column.dtype, pd.CategoricalDtype):
+        return column
+    if column.isna().all():
+        return column  # nothing to measure a range or cardinality on
+
+    if is_integer_dtype(column.dtype):
+        downcast = "unsigned" if unsigned and column.min() >= 0 else "integer"
+        narrowed = pd.to_numeric(column, downcast=downcast)
+        # Same-width unsigned types save nothing and make subtraction wrap around
+        return narrowed if narrowed.dtype.itemsize < column.dtype.itemsize else column
+
+    if is_float_dtype(column.dtype):
+        if column.dtype == np.float64:
+            values = column.to_numpy()
+            narrowed = values.astype(np.float32)
+            # Only narrow when every value survives the round trip exactly
+            if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+                return column.astype(np.float32)
+        return column
+
+    if is_object_dtype(column.dtype) or is_string_dtype(column.dtype):
+        if is_object_dtype(column.dtype) and pd.api.types.infer_dtype(column, skipna=True) != "string":
+            return column  # mixed Python objects; leave untouched
+        if len(column) and column.nunique(dropna=True) <= category_threshold * len(column):
+            return column.astype("category")
+        string_dtype = _arrow_string_dtype() if arrow_strings else None
+        if string_dtype is not None and getattr(column.dtype, "storage", None) != "pyarrow":
+            return column.astype(string_dtype)
+
+    return column
+
+
+def compact_dtypes(df: pd.DataFrame, category_threshold: float = 0.5,
+                   arrow_strings: bool = False,
+                   unsigned: bool = False) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Shrink attribute columns without losing information
+
+    Strings whose distinct count is at most category_threshold times the row
+    count become categoricals, integers are downcast to the smallest signed
+    type that holds their range (unsigned for non-negative columns when
+    unsigned=True), and float64 columns become float32 only when every
+    value is exactly representable. With arrow_strings, remaining string
+    columns are stored as Arrow-backed strings. Geometry and all-null
+    columns are left alone.
+
+    Returns (compacted frame, report) where the report lists each column's
+    dtype and deep memory usage before and after.
+    """
+    compacted = df.copy(deep=False)
+    rows = []
+    for name in df.columns:
+        column = df[name]
+        if getattr(column.dtype, "name", None) == "geometry":
+            continue
+        new_column = _compact_column(column, category_threshold, arrow_strings, unsigned)
+        compacted[name] = new_column
+
+        before = int(column.memory_usage(deep=True, index=False))
+        after = int(new_column.memory_usage(deep=True, index=False))
+        rows.append({
+            "column": name,
+            "dtype_before": str(column.dtype),
+            "dtype_after": str(new_column.dtype),
+            "bytes_before": before,
+            "bytes_after": after,
+            "bytes_saved": before - after,
+        })
+
+    report = pd.DataFrame(rows, columns=["column", "dtype_before", "dtype_after",
+                                         "bytes_before", "bytes_after", "bytes_saved"])
+    return compacted, report.set_index("column")
@@ -0,0 +1,134 @@
+"""
+Random-Access Feature Reads
+Path: E:\\GeoSpatial_Python\\GisProgramming\\src\\data_processing\\random_access.py
+"""
+
+import json
+from pathlib import Path
+from typing import Iterable
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+from .arrow_io import tag_geoparquet_geometry
+
+
+def _sql_literal(value) -> str:
+    """OGR SQL literal for an ID (NumPy scalars become plain Python values first)"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    if isinstance(value, (bool, int, float)):
+        return str(int(value) if isinstance(value, bool) else value)
+    raise TypeError(f"Unsupported ID type for a FlatGeobuf lookup: {type(value).__name__}")
+
+
+class RandomAccessReader:
+    """Fetch a handful of features from a large FlatGeobuf or GeoParquet file
+
+    FlatGeobuf lookups go through GDAL, which walks the file's packed Hilbert
+    R-tree and seeks to matching features. GeoParquet files are
+    memory-mapped, and row groups are skipped using the min/max statistics
+    of the bbox covering column and of the ID column. Lookups only touch the
+    parts of the file that can match. For GeoParquet that pruning relies on
+    the file being written spatially sorted (save_processed_data with
+    spatial_sort=True).
+    """
+
+    def __init__(self, file_path: Path):
+        self.file_path = Path(file_path)
+        suffix = self.file_path.suffix.lower()
+        if suffix == ".fgb":
+            self.format = "FlatGeobuf"
+        elif suffix == ".parquet":
+            self.format = "Parquet"
+            self._open_parquet()
+        else:
+            raise ValueError(f"Random access needs a .fgb or .parquet file: {self.file_path}")
+
+    def _open_parquet(self) -> None:
+        import pyarrow.parquet as pq
+
+        self._parquet = pq.ParquetFile(self.file_path, memory_map=True)
+        geo = json.loads((self._parquet.schema_arrow.metadata or {}).get(b"geo", b"{}"))
+        self.geometry_column = geo.get("primary_column", "geometry")
+        column = geo.get("columns", {}).get(self.geometry_column, {})
+        self._covering = column.get("covering", {}).get("bbox")
+        row_counts = [self._parquet.metadata.row_group(i).num_rows
+                      for i in range(self._parquet.num_row_groups)]
+        self._row_group_starts = np.concatenate([[0], np.cumsum(row_counts)])
+
+    def _read_parquet(self, filter_expression=None) -> gpd.GeoDataFrame:
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(self.file_path, filters=filter_expression, memory_map=True)
+        return self._to_geodataframe(table)
+
+    def _to_geodataframe(self, table) -> gpd.GeoDataFrame:
+        if self._covering:
+            # The bbox covering column is an index aid, not an attribute
+            table = table.drop_columns([self._covering["xmin"][0]])
+        return gpd.GeoDataFrame.from_arrow(tag_geoparquet_geometry(table))
+
+    def _empty(self) -> gpd.GeoDataFrame:
+        """Zero-row frame with the file's columns, built without reading any features"""
+        if self.format == "FlatGeobuf":
+            return gpd.read_file(self.file_path, fids=[], engine="pyogrio")
+        return self._to_geodataframe(self._parquet.schema_arrow.empty_table())
+
+    def by_fids(self, fids: Iterable[int]) -> gpd.GeoDataFrame:
+        """Features at the given 0-based positions in the file"""
+        fids = np.unique(np.asarray(list(fids), dtype=np.int64))
+        if self.format == "FlatGeobuf":
+            return gpd.read_file(self.file_path, fids=fids, engine="pyogrio")
+
+        groups = np.searchsorted(self._row_group_starts, fids, side="right") - 1
+        valid = (fids >= 0) & (groups < self._parquet.num_row_groups)
+        fids, groups = fids[valid], groups[valid]
+        needed = np.unique(groups)
+        if len(needed) == 0:
+            return self._empty()
+
+        # Position of each requested row inside the concatenated row groups
+        sizes = np.diff(self._row_group_starts)[needed]
+        subset_starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        positions = subset_starts[np.searchsorted(needed, groups)] + (fids - self._row_group_starts[groups])
+        table = self._parquet.read_row_groups(needed.tolist())
+        return self._to_geodataframe(table.take(positions))
+
+    def by_ids(self, ids: Iterable, column: str) -> gpd.GeoDataFrame:
+        """Features whose attribute column matches any of ids
+
+        For GeoParquet, row groups whose min/max statistics exclude every ID
+        are skipped. FlatGeobuf has no attribute index, so its features are
+        filtered by GDAL as they stream past.
+        """
+        ids = list(ids)
+        if not ids:
+            return self._empty()
+        if self.format == "FlatGeobuf":
+            values = ", ".join(_sql_literal(value) for value in ids)
+            return gpd.read_file(self.file_path, where=f'"{column}" IN ({values})', engine="pyogrio")
+
+        import pyarrow.compute as pc
+
+        return self._read_parquet(pc.field(column).isin(ids))
+
+    def by_bbox(self, bbox: tuple) -> gpd.GeoDataFrame:
+        """Features intersecting bbox (minx, miny, maxx, maxy, in the file's CRS)"""
+        if self.format == "FlatGeobuf":
+            return gpd.read_file(self.file_path, bbox=tuple(bbox), engine="pyogrio")
+
+        import pyarrow.compute as pc
+
+        minx, miny, maxx, maxy = bbox
+        expression = None
+        if self._covering:
+            xmin, ymin, xmax, ymax = (pc.field(*self._covering[axis])
+                                      for axis in ("xmin", "ymin", "xmax", "ymax"))
+            expression = (xmin <= maxx) & (xmax >= minx) & (ymin <= maxy) & (ymax >= miny)
+        gdf = self._read_parquet(expression)
+        # The covering bbox only narrows candidates; confirm against the geometry
+        return gdf[gdf.intersects(shapely.box(minx, miny, maxx, maxy))]
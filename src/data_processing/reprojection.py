@@ -0,0 +1,119 @@
+"""
+Batched CRS Transformation
+Path: E:\\GeoSpatial_Python\\GisProgramming\\src\\data_processing\\reprojection.py
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import geopandas as gpd
+import numpy as np
+import shapely
+from pyproj import CRS, Transformer
+
+_local = threading.local()
+
+
+def get_transformer(src_crs, dst_crs) -> Transformer:
+    """Cached always_xy Transformer for a CRS pair
+
+    Transformer setup (PROJ pipeline lookup) is the expensive part of
+    reprojecting small frames. pyproj Transformers must not be shared across
+    threads, so the cache is per thread (and per process).
+    """
+    cache = getattr(_local, "transformers", None)
+    if cache is None:
+        cache = _local.transformers = {}
+    key = (CRS.from_user_input(src_crs).to_wkt(), CRS.from_user_input(dst_crs).to_wkt())
+    transformer = cache.get(key)
+    if transformer is None:
+        transformer = cache[key] = Transformer.from_crs(key[0], key[1], always_xy=True)
+    return transformer
+
+
+def transform_coordinates(x: np.ndarray, y: np.ndarray, src_crs, dst_crs, z: Optional[np.ndarray] = None):
+    """Transform coordinate arrays in one bulk PROJ call"""
+    transformer = get_transformer(src_crs, dst_crs)
+    if z is None:
+        return transformer.transform(x, y)
+    return transformer.transform(x, y, z)
+
+
+def transform_geometries(geometries: np.ndarray, src_crs, dst_crs) -> np.ndarray:
+    """Reproject an array of shapely geometries
+
+    All coordinates are pulled out in one pass, transformed in a single
+    vectorized call and written back, with no per-geometry Python callbacks.
+    Geometries with and without Z are transformed separately, since a 2D
+    geometry given a NaN z would come back with NaN coordinates.
+    """
+    geometries = np.asarray(geometries, dtype=object)
+    transformer = get_transformer(src_crs, dst_crs)
+
+    def project_xy(coords: np.ndarray) -> np.ndarray:
+        return np.column_stack(transformer.transform(coords[:, 0], coords[:, 1]))
+
+    def project_xyz(coords: np.ndarray) -> np.ndarray:
+        return np.column_stack(transformer.transform(coords[:, 0], coords[:, 1], coords[:, 2]))
+
+    has_z = shapely.has_z(geometries)
+    if not has_z.any():
+        return shapely.transform(geometries, project_xy)
+    if has_z.all():
+        return shapely.transform(geometries, project_xyz, include_z=True)
+    result = np.empty(len(geometries), dtype=object)
+    result[~has_z] = shapely.transform(geometries[~has_z], project_xy)
+    result[has_z] = shapely.transform(geometries[has_z], project_xyz, include_z=True)
+    return result
+
+
+def _transform_wkb_chunk(wkb: np.ndarray, src_wkt: str, dst_wkt: str) -> np.ndarray:
+    """Worker entry point: WKB in, WKB out, so chunks pickle cheaply"""
+    geometries = shapely.from_wkb(wkb)
+    return shapely.to_wkb(transform_geometries(geometries, src_wkt, dst_wkt))
+
+
+class Reprojector:
+    """Reprojects GeoDataFrames with cached transformers and optional process parallelism
+
+    Frames with at least parallel_threshold rows are split into chunks and
+    transformed in worker processes; smaller frames are transformed
+    in-process, where pool start-up would cost more than it saves.
+    """
+
+    def __init__(self, workers: Optional[int] = None, parallel_threshold: int = 1_000_000):
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel_threshold = parallel_threshold
+
+    def reproject(self, gdf: gpd.GeoDataFrame, to_crs) -> gpd.GeoDataFrame:
+        """Return gdf in to_crs (gdf itself if it is already there)"""
+        if gdf.crs is None:
+            raise ValueError("Cannot reproject data without a CRS; set one with set_crs first")
+        dst_crs = CRS.from_user_input(to_crs)
+        if gdf.crs == dst_crs:
+            return gdf
+
+        geometries = np.asarray(gdf.geometry.values, dtype=object)
+        if len(geometries) >= self.parallel_threshold and self.workers > 1:
+            transformed = self._transform_parallel(geometries, gdf.crs, dst_crs)
+        else:
+            transformed = transform_geometries(geometries, gdf.crs, dst_crs)
+
+        result = gdf.copy(deep=False)
+        result[gdf.geometry.name] = gpd.GeoSeries(transformed, index=gdf.index, crs=dst_crs)
+        return result.set_crs(dst_crs, allow_override=True)
+
+    def _transform_parallel(self, geometries: np.ndarray, src_crs, dst_crs) -> np.ndarray:
+        chunks = np.array_split(shapely.to_wkb(geometries), self.workers)
+        src_wkt, dst_wkt = CRS.from_user_input(src_crs).to_wkt(), dst_crs.to_wkt()
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            results = executor.map(_transform_wkb_chunk, chunks,
+                                   [src_wkt] * len(chunks), [dst_wkt] * len(chunks))
+            return shapely.from_wkb(np.concatenate(list(results)))
+
+
+def reproject(gdf: gpd.GeoDataFrame, to_crs, workers: Optional[int] = None) -> gpd.GeoDataFrame:
+    """Convenience function to reproject a GeoDataFrame"""
+    return Reprojector(workers=workers).reproject(gdf, to_crs)
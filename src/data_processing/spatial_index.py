@@ -0,0 +1,165 @@
+"""
+Packed R-tree Spatial Index with On-Disk Sidecars
+Path: E:\\GeoSpatial_Python\\GisProgramming\\src\\data_processing\\spatial_index.py
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+MAGIC = b"GPSIDX01"
+HEADER_SIZE = 4096
+NODE_SIZE = 16
+
+
+def hilbert_order(bounds: np.ndarray, level: int = 16) -> np.ndarray:
+    """Positions that sort boxes along a Hilbert curve through their centres"""
+    if len(bounds) == 0:
+        return np.zeros(0, dtype=np.int64)
+    centres_x = (bounds[:, 0] + bounds[:, 2]) / 2
+    centres_y = (bounds[:, 1] + bounds[:, 3]) / 2
+    side = (1 << level) - 1
+
+    def scale(values):
+        low, high = np.nanmin(values), np.nanmax(values)
+        span = high - low if high > low else 1.0
+        return np.nan_to_num((values - low) / span * side).astype(np.int64)
+
+    x, y = scale(centres_x), scale(centres_y)
+    distance = np.zeros(len(bounds), dtype=np.int64)
+    s = 1 << (level - 1)
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        distance += s * s * ((3 * rx) ^ ry)
+        # Rotate the quadrant so the curve stays continuous
+        flip = ~ry
+        swap_x = np.where(flip & rx, side - x, x)
+        swap_y = np.where(flip & rx, side - y, y)
+        x, y = np.where(flip, swap_y, swap_x), np.where(flip, swap_x, swap_y)
+        s >>= 1
+    return np.argsort(distance, kind="stable")
+
+
+class PackedRTree:
+    """Static R-tree over bounding boxes, stored as flat arrays
+
+    Leaves are the input boxes sorted along a Hilbert curve; each level above
+    holds the bounds of NODE_SIZE consecutive children. The arrays can be
+    written to a sidecar file and memory-mapped back, so reopening an index
+    costs nothing no matter how many geometries it covers.
+    """
+
+    def __init__(self, boxes: np.ndarray, order: np.ndarray, level_offsets: list,
+                 node_size: int = NODE_SIZE):
+        self.boxes = boxes
+        self.order = order
+        self.level_offsets = level_offsets
+        self.node_size = node_size
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    @classmethod
+    def from_bounds(cls, bounds: np.ndarray, node_size: int = NODE_SIZE) -> "PackedRTree":
+        """Build the tree from an (n, 4) array of minx, miny, maxx, maxy"""
+        bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 4)
+        order = hilbert_order(bounds)
+        level = bounds[order]
+        levels = [level]
+        while len(level) > 1:
+            groups = np.arange(0, len(level), node_size)
+            # fmin/fmax skip the NaN boxes of empty geometries instead of spreading them upward
+            level = np.column_stack([
+                np.fmin.reduceat(level[:, 0], groups),
+                np.fmin.reduceat(level[:, 1], groups),
+                np.fmax.reduceat(level[:, 2], groups),
+                np.fmax.reduceat(level[:, 3], groups),
+            ])
+            levels.append(level)
+
+        offsets = np.cumsum([0] + [len(lv) for lv in levels]).tolist()
+        boxes = np.concatenate(levels) if levels else np.zeros((0, 4))
+        return cls(boxes, order.astype(np.int64), offsets, node_size)
+
+    @classmethod
+    def from_geometries(cls, geometries, node_size: int = NODE_SIZE) -> "PackedRTree":
+        """Build the tree from a GeoSeries or array of shapely geometries"""
+        import shapely
+
+        return cls.from_bounds(shapely.bounds(np.asarray(geometries)), node_size)
+
+    def query(self, bbox: tuple) -> np.ndarray:
+        """Original row positions whose boxes intersect bbox, in ascending order"""
+        if len(self.order) == 0:
+            return np.zeros(0, dtype=np.int64)
+        minx, miny, maxx, maxy = bbox
+        top = len(self.level_offsets) - 2
+        candidates = np.arange(self.level_offsets[top + 1] - self.level_offsets[top])
+
+        for level in range(top, -1, -1):
+            start = self.level_offsets[level]
+            nodes = self.boxes[start + candidates]
+            hit = ((nodes[:, 0] <= maxx) & (nodes[:, 2] >= minx) &
+                   (nodes[:, 1] <= maxy) & (nodes[:, 3] >= miny))
+            candidates = candidates[hit]
+            if level == 0 or len(candidates) == 0:
+                break
+            # Expand surviving nodes to their children on the level below
+            level_size = self.level_offsets[level] - self.level_offsets[level - 1]
+            children = (candidates[:, None] * self.node_size + np.arange(self.node_size)).ravel()
+            candidates = children[children < level_size]
+
+        if len(candidates) == 0 or level != 0:
+            return np.zeros(0, dtype=np.int64)
+        return np.sort(self.order[candidates])
+
+    def save(self, path: Path, metadata: Optional[dict] = None) -> Path:
+        """Write the tree to a sidecar file (atomically) with optional metadata"""
+        path = Path(path)
+        header = json.dumps({
+            "node_size": self.node_size,
+            "count": len(self.order),
+            "level_offsets": self.level_offsets,
+            "metadata": metadata or {},
+        }).encode()
+        if len(header) + len(MAGIC) + 8 > HEADER_SIZE:
+            raise ValueError("Spatial index metadata too large for the header")
+
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(header).to_bytes(8, "little"))
+            f.write(header)
+            f.write(b"\0" * (HEADER_SIZE - len(MAGIC) - 8 - len(header)))
+            f.write(np.ascontiguousarray(self.boxes, dtype="<f8").tobytes())
+            f.write(np.ascontiguousarray(self.order, dtype="<i8").tobytes())
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def read_header(cls, path: Path) -> Optional[dict]:
+        """Header of a sidecar file, or None if it is missing or not an index"""
+        try:
+            with open(path, "rb") as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    return None
+                length = int.from_bytes(f.read(8), "little")
+                return json.loads(f.read(length))
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def load(cls, path: Path) -> "PackedRTree":
+        """Memory-map a sidecar written by save()"""
+        header = cls.read_header(path)
+        if header is None:
+            raise ValueError(f"Not a spatial index file: {path}")
+        node_count = header["level_offsets"][-1]
+        boxes = np.memmap(path, dtype="<f8", mode="r", offset=HEADER_SIZE, shape=(node_count, 4))
+        order = np.memmap(path, dtype="<i8", mode="r", offset=HEADER_SIZE + node_count * 32,
+                          shape=(header["count"],))
+        return cls(boxes, order, header["level_offsets"], header["node_size"])
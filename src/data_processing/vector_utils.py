@@ -5,47 +5,137 @@ Path: E:\GeoSpatial_Python\GisProgramming\src\data_processing\vector_utils.py
 
 import geopandas as gpd
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Union, List, Optional
+from typing import Union, List, Optional, Dict, Tuple, Iterator
+import hashlib
 import warnings
-import sys
 
-# Add project root to path
-sys.path.append(str(Path(__file__).parent.parent))
-from config import Config
+try:
+    from ..config import Config
+except ImportError:
+    # Imported as a top-level package with src/ on sys.path (notebooks)
+    from config import Config
+from .cache import ParquetCache, MemoryCache, cache_key, options_fingerprint
+from .async_io import AsyncRunner
+from .catalog import VectorCatalog
+from .dtypes import compact_dtypes
+from .reprojection import Reprojector
+from .random_access import RandomAccessReader
+from .spatial_index import PackedRTree
+from .archives import split_archive_path, source_stat, to_vsi_path, archive_member_exists
+from .arrow_io import read_vector_arrow, read_geoparquet_arrow, to_geoarrow_native
+from .writers import resolve_output_format, driver_for_path, write_atomic, VectorBatchWriter
 
 class VectorDataProcessor:
     """Class for processing vector geospatial data"""
     
-    def __init__(self):
+    def __init__(self, disk_cache: bool = True, memory_cache_bytes: Optional[int] = None,
+                 use_catalog: bool = True, async_workers: int = 4,
+                 reproject_workers: Optional[int] = None):
         self.config = Config()
+        self.reprojector = Reprojector(workers=reproject_workers)
+        self.async_workers = async_workers
+        self._async_runner = None
+        self.use_catalog = use_catalog
+        self._catalog = None
+        self.disk_cache = None
+        if disk_cache and _parquet_available():
+            self.disk_cache = ParquetCache(self.config.VECTOR_CACHE_DIR,
+                                           self.config.VECTOR_CACHE_MAX_BYTES)
+        self.memory_cache = MemoryCache(memory_cache_bytes) if memory_cache_bytes else None
     
-    def load_shapefile(self, filename: str, subfolder: str = None) -> gpd.GeoDataFrame:
+    def invalidate_cache(self, filename: Optional[str] = None, data_format: str = "auto") -> int:
+        """Drop cached copies of one vector file, or the whole cache if filename is None"""
+        file_path = None if filename is None else self._resolve_vector_path(filename, data_format)
+        removed = 0
+        for cache in (self.disk_cache, self.memory_cache):
+            if cache is not None:
+                removed += cache.invalidate(file_path)
+        return removed
+    
+    def cache_stats(self) -> dict:
+        """Hit/miss statistics of the in-memory cache (empty if disabled)"""
+        return self.memory_cache.stats() if self.memory_cache is not None else {}
+    
+    def _load(self, file_path: Path, read_options: dict,
+              compact: Union[bool, str] = False, to_crs=None) -> gpd.GeoDataFrame:
+        """Load through the memory cache, then the disk cache, then the file"""
+        if self.memory_cache is None:
+            gdf = _load_vector_file(file_path, read_options, self.disk_cache)
+        else:
+            key = cache_key(file_path, read_options)
+            gdf = self.memory_cache.get(key)
+            if gdf is None:
+                gdf = _load_vector_file(file_path, read_options, self.disk_cache)
+                self.memory_cache.put(key, gdf)
+        # Caches hold the file's native CRS so one entry serves every target CRS
+        return _apply_compact(self._reproject(gdf, to_crs), compact)
+    
+    def _reproject(self, gdf: gpd.GeoDataFrame, to_crs) -> gpd.GeoDataFrame:
+        """Reproject gdf when a target CRS is given"""
+        if to_crs is None:
+            return gdf
+        return self.reprojector.reproject(gdf, to_crs)
+    
+    def load_shapefile(self, filename: str, subfolder: str = None,
+                       columns: Optional[List[str]] = None, bbox: Optional[tuple] = None,
+                       mask=None, where: Optional[str] = None,
+                       rows: Optional[Union[int, slice]] = None,
+                       compact: Union[bool, str] = False, to_crs=None) -> gpd.GeoDataFrame:
         """Load shapefile from shapefiles directory"""
         if subfolder:
             file_path = self.config.SHAPEFILES_DIR / subfolder / filename
         else:
             file_path = self.config.SHAPEFILES_DIR / filename
             
-        if not file_path.exists():
+        if not _vector_path_exists(file_path):
             raise FileNotFoundError(f"Shapefile not found: {file_path}")
         
-        return gpd.read_file(file_path)
+        return self._load(file_path, _read_options(columns, bbox, mask, where, rows), compact, to_crs)
     
-    def load_geojson(self, filename: str, subfolder: str = None) -> gpd.GeoDataFrame:
+    def load_geojson(self, filename: str, subfolder: str = None,
+                     columns: Optional[List[str]] = None, bbox: Optional[tuple] = None,
+                     mask=None, where: Optional[str] = None,
+                     rows: Optional[Union[int, slice]] = None,
+                     compact: Union[bool, str] = False, to_crs=None) -> gpd.GeoDataFrame:
         """Load GeoJSON from geojson directory"""
         if subfolder:
             file_path = self.config.GEOJSON_DIR / subfolder / filename
         else:
             file_path = self.config.GEOJSON_DIR / filename
             
-        if not file_path.exists():
+        if not _vector_path_exists(file_path):
             raise FileNotFoundError(f"GeoJSON not found: {file_path}")
         
-        return gpd.read_file(file_path)
+        return self._load(file_path, _read_options(columns, bbox, mask, where, rows), compact, to_crs)
+    
+    @property
+    def catalog(self) -> VectorCatalog:
+        """Metadata catalog of the raw, processed and external data directories"""
+        if self._catalog is None:
+            self._catalog = VectorCatalog(
+                self.config.CATALOG_PATH,
+                roots=[self.config.RAW_DATA_DIR, self.config.PROCESSED_DATA_DIR,
+                       self.config.EXTERNAL_DATA_DIR],
+                exclude=[self.config.CACHE_DIR]
+            )
+        return self._catalog
+    
+    def refresh_catalog(self) -> dict:
+        """Re-read metadata for new or changed files; returns change counts"""
+        return self.catalog.refresh()
     
-    def load_vector_data(self, filename: str, data_format: str = "auto") -> gpd.GeoDataFrame:
-        """Load vector data with automatic format detection"""
+    def find_layers(self, bbox: Optional[tuple] = None, crs: str = "EPSG:4326",
+                    name: Optional[str] = None, geometry_type: Optional[str] = None,
+                    refresh: bool = True) -> List[dict]:
+        """Catalogued layers matching a name, geometry type and/or intersecting bbox"""
+        if refresh:
+            self.catalog.refresh()
+        return self.catalog.layers(name=name, bbox=bbox, crs=crs, geometry_type=geometry_type)
+    
+    def _resolve_vector_path(self, filename: str, data_format: str = "auto") -> Path:
+        """Resolve a vector filename to a path using the auto-format search order"""
         file_path = None
         
         if data_format == "auto":
@@ -54,46 +144,458 @@ class VectorDataProcessor:
                 self.config.SHAPEFILES_DIR / filename,
                 self.config.GEOJSON_DIR / filename,
                 self.config.VECTOR_OTHER_DIR / filename,
-                self.config.VECTOR_DIR / filename
+                self.config.VECTOR_DIR / filename,
+                self.config.EXTERNAL_DATA_DIR / filename
             ]
             
-            for path in possible_paths:
-                if path.exists():
-                    file_path = path
-                    break
+            # An in-memory catalog lookup plus one probe to confirm the hit
+            # replaces probing every directory; files added or moved since
+            # the last refresh still fall back to probing
+            if self.use_catalog and (self._catalog is not None or self.config.CATALOG_PATH.exists()):
+                file_path = self.catalog.resolve(possible_paths)
+                if file_path is not None and not _vector_path_exists(file_path):
+                    file_path = None
+            
+            if file_path is None:
+                for path in possible_paths:
+                    if _vector_path_exists(path):
+                        file_path = path
+                        break
         else:
             file_path = self.config.get_data_path("vector", data_format) / filename
+            if not _vector_path_exists(file_path):
+                file_path = None
         
-        if file_path is None or not file_path.exists():
+        if file_path is None:
             raise FileNotFoundError(f"Vector file not found: {filename}")
         
-        return gpd.read_file(file_path)
+        return file_path
+    
+    def load_vector_data(self, filename: str, data_format: str = "auto",
+                         columns: Optional[List[str]] = None, bbox: Optional[tuple] = None,
+                         mask=None, where: Optional[str] = None,
+                         rows: Optional[Union[int, slice]] = None,
+                         compact: Union[bool, str] = False, to_crs=None) -> gpd.GeoDataFrame:
+        """Load vector data with automatic format detection
+        
+        columns, bbox, mask, where and rows are pushed down to the reader so
+        unselected fields and features are never decoded. bbox and mask are in
+        the file's CRS; where is an OGR SQL WHERE clause.
+        
+        compact=True shrinks attribute dtypes losslessly (see compact_dtypes)
+        and compact="arrow" also stores strings Arrow-backed; the per-column
+        memory report is left in gdf.attrs["compact_report"].
+        
+        to_crs reprojects the result (any pyproj CRS input, e.g. "EPSG:3857");
+        filters still use the file's CRS.
+        """
+        file_path = self._resolve_vector_path(filename, data_format)
+        return self._load(file_path, _read_options(columns, bbox, mask, where, rows), compact, to_crs)
+    
+    def load_arrow(self, filename: str, data_format: str = "auto",
+                   geometry_encoding: str = "wkb", **read_options):
+        """Load vector data as a pyarrow Table instead of a GeoDataFrame
+        
+        Reads through GDAL's Arrow stream (or memory-maps the cached GeoParquet
+        copy when one exists), so no pandas or shapely objects are built.
+        geometry_encoding "wkb" gives a geoarrow.wkb column; "geoarrow" converts
+        to GeoArrow's native layout. Filters work as in load_vector_data. Use
+        arrow_to_geodataframe() to get a GeoDataFrame later.
+        """
+        if geometry_encoding not in ("wkb", "geoarrow"):
+            raise ValueError(f"Unknown geometry encoding: {geometry_encoding}")
+        
+        file_path = self._resolve_vector_path(filename, data_format)
+        options = _read_options(**read_options)
+        
+        cached = None
+        if self.disk_cache is not None:
+            cached = self.disk_cache.lookup(self.disk_cache.key(file_path, options))
+        table = read_geoparquet_arrow(cached) if cached else read_vector_arrow(file_path, options)
+        
+        if geometry_encoding == "geoarrow":
+            table = to_geoarrow_native(table)
+        return table
+    
+    def load_many(self, filenames: List[str], data_format: str = "auto",
+                  workers: Optional[int] = None, concat: bool = False,
+                  source_column: str = "source_file", compact: Union[bool, str] = False,
+                  to_crs=None, **read_options
+                  ) -> Tuple[Union[Dict[str, gpd.GeoDataFrame], gpd.GeoDataFrame], Dict[str, str]]:
+        """Load several vector files in a process pool
+        
+        Returns (frames, errors). frames maps filename to GeoDataFrame, or is a
+        single GeoDataFrame with a source column when concat=True. errors maps
+        each filename that failed to its error message; one bad file does not
+        abort the batch. Extra keyword arguments (columns, bbox, mask, where,
+        rows) are pushed down to every read as in load_vector_data. compact is
+        applied after concatenation so categories span all files. to_crs
+        reprojects every frame; without it, concat=True moves files in other
+        CRSs to the first file's CRS (with a warning).
+        """
+        options = _read_options(**read_options)
+        frames = {}
+        errors = {}
+        paths = {}
+        
+        # Resolve in the parent so missing files never reach a worker
+        for filename in filenames:
+            try:
+                paths[filename] = self._resolve_vector_path(filename, data_format)
+            except FileNotFoundError as e:
+                errors[filename] = str(e)
+        
+        # Serve what we can from memory; only the rest goes to workers
+        if self.memory_cache is not None:
+            for filename, path in list(paths.items()):
+                cached = self.memory_cache.get(cache_key(path, options))
+                if cached is not None:
+                    frames[filename] = cached
+                    del paths[filename]
+        
+        if workers == 1 or len(paths) <= 1:
+            for filename, path in paths.items():
+                try:
+                    frames[filename] = _load_vector_file(path, options, self.disk_cache)
+                except Exception as e:
+                    errors[filename] = f"{type(e).__name__}: {e}"
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {filename: executor.submit(_load_vector_file, path, options, self.disk_cache)
+                           for filename, path in paths.items()}
+                for filename, future in futures.items():
+                    try:
+                        frames[filename] = future.result()
+                    except Exception as e:
+                        errors[filename] = f"{type(e).__name__}: {e}"
+        
+        if self.memory_cache is not None:
+            for filename, path in paths.items():
+                if filename in frames:
+                    self.memory_cache.put(cache_key(path, options), frames[filename])
+        
+        # Keep the caller's ordering regardless of completion order
+        ordered = {}
+        for filename in filenames:
+            if filename in frames:
+                try:
+                    ordered[filename] = self._reproject(frames[filename], to_crs)
+                except ValueError as e:
+                    errors[filename] = str(e)
+        frames = ordered
+        if concat and to_crs is None:
+            frames = self._align_crs(frames, errors)
+        
+        for filename, message in errors.items():
+            warnings.warn(f"Failed to load {filename}: {message}")
+        
+        if concat:
+            if not frames:
+                return gpd.GeoDataFrame(), errors
+            combined = pd.concat(
+                [gdf.assign(**{source_column: f}) for f, gdf in frames.items()],
+                ignore_index=True
+            )
+            combined = gpd.GeoDataFrame(combined, crs=next(iter(frames.values())).crs)
+            return _apply_compact(combined, compact), errors
+        
+        return {f: _apply_compact(gdf, compact) for f, gdf in frames.items()}, errors
+    
+    def _align_crs(self, frames: Dict[str, gpd.GeoDataFrame],
+                   errors: Dict[str, str]) -> Dict[str, gpd.GeoDataFrame]:
+        """Bring frames to the first frame's CRS so they can be concatenated
+        
+        Frames that cannot be moved there (one side has no CRS) are dropped
+        and reported in errors instead of failing the whole concatenation.
+        """
+        if not frames:
+            return frames
+        target = next(iter(frames.values())).crs
+        aligned = {}
+        for filename, gdf in frames.items():
+            if gdf.crs == target:
+                aligned[filename] = gdf
+            elif gdf.crs is None or target is None:
+                errors[filename] = (f"CRS {gdf.crs} does not match {target} of the first file; "
+                                    f"set a CRS or pass to_crs= to concatenate")
+            else:
+                warnings.warn(f"Reprojecting {filename} from {gdf.crs} to {target} for "
+                              f"concatenation; pass to_crs= to choose the target CRS")
+                aligned[filename] = self.reprojector.reproject(gdf, target)
+        return aligned
+    
+    def iter_vector_chunks(self, filename: str, chunk_size: int = 100_000,
+                           data_format: str = "auto", to_crs=None,
+                           **read_options) -> Iterator[gpd.GeoDataFrame]:
+        """Yield a vector file as GeoDataFrame batches of at most chunk_size rows
+        
+        Only one batch is held in memory at a time. Every batch carries the
+        columns and CRS of the first one, and a running index so batches can
+        be concatenated back together. Filters (columns, bbox, mask, where)
+        are pushed down to the reader as in load_vector_data; to_crs
+        reprojects each batch.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+        
+        file_path = self._resolve_vector_path(filename, data_format)
+        options = _read_options(**read_options)
+        options.pop("rows", None)
+        
+        try:
+            import pyogrio
+            import pyarrow  # noqa: F401 (needed by pyogrio.open_arrow)
+        except ImportError:
+            chunks = _iter_row_slices(file_path, chunk_size, options)
+        else:
+            chunks = _iter_arrow_batches(pyogrio, file_path, chunk_size, options)
+        
+        columns = None
+        crs = None
+        start = 0
+        for chunk in chunks:
+            if columns is None:
+                columns = list(chunk.columns)
+                crs = chunk.crs
+            else:
+                chunk = chunk.reindex(columns=columns)
+                if chunk.crs != crs:
+                    chunk = chunk.set_crs(crs, allow_override=True)
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            start += len(chunk)
+            yield self._reproject(chunk, to_crs)
     
     def save_processed_data(self, gdf: gpd.GeoDataFrame, filename: str, 
-                           format: str = "shapefile") -> Path:
-        """Save processed vector data"""
-        if format.lower() in ["shapefile", "shp"]:
-            output_path = self.config.PROCESSED_DATA_DIR / f"{filename}.shp"
-        elif format.lower() in ["geojson", "json"]:
-            output_path = self.config.PROCESSED_DATA_DIR / f"{filename}.geojson"
+                           format: str = "shapefile", compression: str = "snappy",
+                           spatial_index: bool = True, spatial_sort: bool = False,
+                           **write_options) -> Path:
+        """Save processed vector data
+        
+        format is one of shapefile, geojson, geoparquet, flatgeobuf or
+        geopackage (or their short names); anything else writes filename as
+        given and lets GDAL pick the driver from its extension. compression
+        applies to GeoParquet, spatial_index to FlatGeobuf and GeoPackage.
+        spatial_sort=True writes GeoParquet rows in Hilbert order so
+        RandomAccessReader can skip row groups by bbox; it changes the saved
+        row order. The file is written to a temporary location and renamed
+        into place, so a partial output never appears in PROCESSED_DATA_DIR.
+        """
+        suffix, driver = resolve_output_format(format)
+        if suffix is not None:
+            output_path = self.config.PROCESSED_DATA_DIR / f"{filename}{suffix}"
         else:
             output_path = self.config.PROCESSED_DATA_DIR / filename
+            driver = driver_for_path(output_path)
         
-        gdf.to_file(output_path)
+        write_atomic(gdf, output_path, driver, compression=compression,
+                     spatial_index=spatial_index, spatial_sort=spatial_sort, **write_options)
         print(f"Data saved to: {output_path}")
         return output_path
     
-    def list_available_files(self) -> dict:
-        """List all available vector files"""
+    def open_writer(self, filename: str, format: str = "geopackage", layer: Optional[str] = None,
+                    compression: str = "snappy", spatial_index: bool = True) -> VectorBatchWriter:
+        """Open a batch writer for an output in PROCESSED_DATA_DIR
+        
+        Use as a context manager and call write() once per GeoDataFrame batch;
+        format is geopackage, flatgeobuf or geoparquet.
+        """
+        suffix, driver = resolve_output_format(format)
+        if suffix is None:
+            raise ValueError(f"Unknown output format: {format}")
+        output_path = self.config.PROCESSED_DATA_DIR / f"{filename}{suffix}"
+        return VectorBatchWriter(output_path, driver, layer=layer, compression=compression,
+                                 spatial_index=spatial_index)
+    
+    @property
+    def async_runner(self) -> AsyncRunner:
+        """Bounded thread pool behind the *_async methods"""
+        if self._async_runner is None:
+            self._async_runner = AsyncRunner(self.async_workers)
+        return self._async_runner
+    
+    async def load_shapefile_async(self, filename: str, subfolder: str = None, **options) -> gpd.GeoDataFrame:
+        """Awaitable load_shapefile; concurrent identical calls share one read"""
+        key = ("shapefile", filename, subfolder, options_fingerprint(options))
+        return await self.async_runner.run(key, self.load_shapefile, filename, subfolder, **options)
+    
+    async def load_geojson_async(self, filename: str, subfolder: str = None, **options) -> gpd.GeoDataFrame:
+        """Awaitable load_geojson; concurrent identical calls share one read"""
+        key = ("geojson", filename, subfolder, options_fingerprint(options))
+        return await self.async_runner.run(key, self.load_geojson, filename, subfolder, **options)
+    
+    async def load_vector_data_async(self, filename: str, data_format: str = "auto",
+                                     **options) -> gpd.GeoDataFrame:
+        """Awaitable load_vector_data; concurrent identical calls share one read
+        
+        Reads run on a thread pool of async_workers threads so the event loop
+        never blocks. Cancelling the awaiting task detaches that caller only.
+        """
+        key = ("vector", filename, data_format, options_fingerprint(options))
+        return await self.async_runner.run(key, self.load_vector_data, filename, data_format, **options)
+    
+    async def save_processed_data_async(self, gdf: gpd.GeoDataFrame, filename: str,
+                                        format: str = "shapefile", **options) -> Path:
+        """Awaitable save_processed_data, run on the same bounded thread pool"""
+        return await self.async_runner.run(None, self.save_processed_data, gdf, filename, format, **options)
+    
+    def close(self) -> None:
+        """Shut down the async thread pool, if one was started"""
+        if self._async_runner is not None:
+            self._async_runner.shutdown()
+            self._async_runner = None
+    
+    def load_spatial_index(self, filename: str, data_format: str = "auto",
+                           gdf: Optional[gpd.GeoDataFrame] = None, **read_options) -> PackedRTree:
+        """Packed R-tree over a vector file's geometries, persisted as a sidecar
+        
+        The index is built once and saved next to the source as
+        <file>.sidx (one sidecar per set of read options). Later calls
+        memory-map it instead of rebuilding. A sidecar is rebuilt whenever the
+        source's size or mtime no longer matches. Query results are row
+        positions in the frame load_vector_data returns for the same options;
+        pass that frame as gdf to avoid reloading it on a rebuild.
+        """
+        file_path = self._resolve_vector_path(filename, data_format)
+        options = _read_options(**read_options)
+        fingerprint = options_fingerprint(options)
+        suffix = f".{hashlib.sha1(fingerprint.encode()).hexdigest()[:8]}.sidx" if options else ".sidx"
+        archive, member = split_archive_path(file_path)
+        if archive is not None:
+            # Archives are read-only containers, so the sidecar sits beside them
+            label = archive.name + (f".{member.replace('/', '_')}" if member else "")
+            sidecar = archive.with_name(label + suffix)
+        else:
+            sidecar = file_path.with_name(file_path.name + suffix)
+        
+        stat = source_stat(file_path)
+        expected = {"source_size": stat.st_size, "source_mtime_ns": stat.st_mtime_ns,
+                    "options": fingerprint}
+        header = PackedRTree.read_header(sidecar)
+        if header is not None and header["metadata"] == expected:
+            return PackedRTree.load(sidecar)
+        
+        if gdf is None:
+            gdf = self._load(file_path, options)
+        tree = PackedRTree.from_geometries(gdf.geometry.values)
+        try:
+            tree.save(sidecar, expected)
+        except OSError as e:
+            warnings.warn(f"Could not write spatial index sidecar {sidecar}: {e}")
+        return tree
+    
+    def open_random_access(self, filename: str) -> RandomAccessReader:
+        """Random-access reader over a FlatGeobuf or GeoParquet file in PROCESSED_DATA_DIR
+        
+        Look features up with by_fids(), by_ids() or by_bbox() without loading
+        the whole file.
+        """
+        file_path = self.config.PROCESSED_DATA_DIR / filename
+        if not file_path.exists():
+            raise FileNotFoundError(f"Processed file not found: {file_path}")
+        return RandomAccessReader(file_path)
+    
+    def list_available_files(self, refresh: bool = True) -> dict:
+        """List all available vector files
+        
+        Served from the metadata catalog, which is refreshed incrementally
+        first unless refresh=False. Layers inside .zip/.gz/.7z archives are
+        listed as archive/member paths that the loaders accept directly. Use
+        find_layers() for CRS, bounds, feature counts and schemas.
+        """
+        if not self.use_catalog:
+            return {
+                "shapefiles": list(self.config.SHAPEFILES_DIR.glob("*.shp")),
+                "geojson": list(self.config.GEOJSON_DIR.glob("*.geojson")) + 
+                          list(self.config.GEOJSON_DIR.glob("*.json")),
+                "other": list(self.config.VECTOR_OTHER_DIR.glob("*"))
+            }
+        
+        if refresh:
+            self.catalog.refresh()
+        
+        def paths_in(directory: Path) -> List[Path]:
+            return sorted({layer["path"] for layer in self.catalog.layers(directory=directory)})
+        
         files = {
-            "shapefiles": list(self.config.SHAPEFILES_DIR.glob("*.shp")),
-            "geojson": list(self.config.GEOJSON_DIR.glob("*.geojson")) + 
-                      list(self.config.GEOJSON_DIR.glob("*.json")),
-            "other": list(self.config.VECTOR_OTHER_DIR.glob("*"))
+            "shapefiles": paths_in(self.config.SHAPEFILES_DIR),
+            "geojson": paths_in(self.config.GEOJSON_DIR),
+            "other": paths_in(self.config.VECTOR_OTHER_DIR),
+            "external": paths_in(self.config.EXTERNAL_DATA_DIR)
         }
         return files
 
-def load_vector_data(filename: str, data_format: str = "auto") -> gpd.GeoDataFrame:
+def _read_options(columns: Optional[List[str]] = None, bbox: Optional[tuple] = None,
+                  mask=None, where: Optional[str] = None,
+                  rows: Optional[Union[int, slice]] = None) -> dict:
+    """Build reader keyword arguments, dropping any that were not requested"""
+    options = {"columns": columns, "bbox": bbox, "mask": mask, "where": where, "rows": rows}
+    return {key: value for key, value in options.items() if value is not None}
+
+def _read_vector_file(file_path: Path, read_options: Optional[dict] = None) -> gpd.GeoDataFrame:
+    """Read a single vector file (module-level so process pools can pickle it)"""
+    return gpd.read_file(to_vsi_path(file_path), **(read_options or {}))
+
+def _iter_arrow_batches(pyogrio, file_path: Path, chunk_size: int,
+                        read_options: dict) -> Iterator[gpd.GeoDataFrame]:
+    """Stream record batches through GDAL's Arrow interface in a single pass"""
+    with pyogrio.open_arrow(to_vsi_path(file_path), batch_size=chunk_size, use_pyarrow=True,
+                            **read_options) as (meta, reader):
+        geometry_name = meta["geometry_name"] or "wkb_geometry"
+        for batch in reader:
+            if batch.num_rows == 0:
+                continue
+            geometry = gpd.GeoSeries.from_wkb(batch.column(geometry_name).to_numpy(zero_copy_only=False),
+                                              crs=meta["crs"])
+            attributes = batch.drop_columns([geometry_name]).to_pandas()
+            yield gpd.GeoDataFrame(attributes, geometry=geometry.values, crs=meta["crs"])
+
+def _iter_row_slices(file_path: Path, chunk_size: int,
+                     read_options: dict) -> Iterator[gpd.GeoDataFrame]:
+    """Fallback streaming reader using consecutive row windows"""
+    start = 0
+    while True:
+        chunk = gpd.read_file(to_vsi_path(file_path), rows=slice(start, start + chunk_size), **read_options)
+        if len(chunk) == 0:
+            return
+        yield chunk
+        if len(chunk) < chunk_size:
+            return
+        start += chunk_size
+
+def _apply_compact(gdf: gpd.GeoDataFrame, compact: Union[bool, str]) -> gpd.GeoDataFrame:
+    """Apply compact_dtypes when requested, recording its report in gdf.attrs"""
+    if not compact:
+        return gdf
+    gdf, report = compact_dtypes(gdf, arrow_strings=(compact == "arrow"))
+    gdf.attrs["compact_report"] = report.to_dict(orient="index")
+    return gdf
+
+def _vector_path_exists(path: Path) -> bool:
+    """Whether path is an existing file or a member of an existing archive"""
+    return path.exists() or archive_member_exists(path)
+
+def _parquet_available() -> bool:
+    """Whether GeoParquet can be written (pyarrow is an optional dependency)"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _load_vector_file(file_path: Path, read_options: Optional[dict] = None,
+                      cache: Optional[ParquetCache] = None) -> gpd.GeoDataFrame:
+    """Read a vector file, going through the on-disk cache when one is given"""
+    if cache is None:
+        return _read_vector_file(file_path, read_options)
+    
+    key = cache.key(file_path, read_options)
+    gdf = cache.get(key)
+    if gdf is None:
+        gdf = _read_vector_file(file_path, read_options)
+        cache.put(key, gdf)
+    return gdf
+
+def load_vector_data(filename: str, data_format: str = "auto", **read_options) -> gpd.GeoDataFrame:
     """Convenience function to load vector data"""
     processor = VectorDataProcessor()
-    return processor.load_vector_data(filename, data_format)
+    return processor.load_vector_data(filename, data_format, **read_options)
@@ -0,0 +1,263 @@
+"""
+Vector Output Writers
+Path: E:\\GeoSpatial_Python\\GisProgramming\\src\\data_processing\\writers.py
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+import geopandas as gpd
+import pandas as pd
+
+# format name -> (file suffix, driver); "Parquet" is written by pyarrow, not OGR
+OUTPUT_FORMATS = {
+    "shapefile": (".shp", "ESRI Shapefile"),
+    "shp": (".shp", "ESRI Shapefile"),
+    "geojson": (".geojson", "GeoJSON"),
+    "json": (".geojson", "GeoJSON"),
+    "geoparquet": (".parquet", "Parquet"),
+    "parquet": (".parquet", "Parquet"),
+    "flatgeobuf": (".fgb", "FlatGeobuf"),
+    "fgb": (".fgb", "FlatGeobuf"),
+    "geopackage": (".gpkg", "GPKG"),
+    "gpkg": (".gpkg", "GPKG"),
+}
+
+PARQUET_ROW_GROUP_SIZE = 65_536
+
+SHAPEFILE_SIDECARS = [".shx", ".dbf", ".prj", ".cpg", ".qix", ".sbn", ".sbx"]
+
+
+def resolve_output_format(format: str) -> tuple:
+    """Return (suffix, driver) for a format name, or (None, None) if unknown"""
+    return OUTPUT_FORMATS.get(format.lower(), (None, None))
+
+
+def driver_for_path(path: Path) -> Optional[str]:
+    """Driver implied by a file's extension, or None to let GDAL decide"""
+    for suffix, driver in OUTPUT_FORMATS.values():
+        if Path(path).suffix.lower() == suffix:
+            return driver
+    return None
+
+
+def _ogr_engine_kwargs() -> dict:
+    """Prefer pyogrio's Arrow write path, which skips per-feature Python objects"""
+    try:
+        import pyogrio  # noqa: F401
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return {}
+    return {"engine": "pyogrio", "use_arrow": True}
+
+
+def write_vector_file(gdf: gpd.GeoDataFrame, output_path: Path, driver: Optional[str],
+                      compression: str = "snappy", spatial_index: bool = True,
+                      spatial_sort: bool = False, layer: Optional[str] = None,
+                      **write_options) -> None:
+    """Write gdf to output_path with the fastest available engine
+
+    driver "Parquet" writes GeoParquet through pyarrow; None lets GDAL pick
+    from the extension. spatial_index builds the packed Hilbert R-tree for
+    FlatGeobuf and the R*Tree for GeoPackage. spatial_sort (GeoParquet only)
+    reorders rows along a Hilbert curve into 64k-row groups, so the
+    per-row-group statistics of the bbox covering column work as a coarse
+    spatial index; rows are then no longer in input order.
+    """
+    if driver == "Parquet":
+        if spatial_sort and len(gdf):
+            default_index = isinstance(gdf.index, pd.RangeIndex)
+            gdf = gdf.iloc[gdf.geometry.hilbert_distance().argsort(kind="stable")]
+            if default_index:
+                # A shuffled RangeIndex would otherwise be stored as __index_level_0__
+                gdf = gdf.reset_index(drop=True)
+            write_options.setdefault("row_group_size", PARQUET_ROW_GROUP_SIZE)
+        gdf.to_parquet(output_path, compression=compression, write_covering_bbox=True,
+                       **write_options)
+        return
+
+    options = _ogr_engine_kwargs()
+    if driver in ("FlatGeobuf", "GPKG"):
+        options["SPATIAL_INDEX"] = "YES" if spatial_index else "NO"
+    if driver == "GPKG":
+        options["layer"] = layer or output_path.stem
+    options.update(write_options)
+    gdf.to_file(output_path, driver=driver, **options)
+
+
+def write_atomic(gdf: gpd.GeoDataFrame, output_path: Path, driver: Optional[str],
+                 **write_options) -> Path:
+    """Write into a temporary directory next to output_path, then rename into place
+
+    The temporary directory is on the same filesystem, so every rename is
+    atomic. For shapefiles the sidecars are moved first and the .shp last,
+    so a reader never sees a .shp without its companions.
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix=f".{output_path.name}.", suffix=".tmp",
+                                    dir=output_path.parent))
+    try:
+        tmp_path = tmp_dir / output_path.name
+        write_vector_file(gdf, tmp_path, driver, **write_options)
+
+        if driver == "ESRI Shapefile":
+            for suffix in SHAPEFILE_SIDECARS:
+                sidecar = tmp_path.with_suffix(suffix)
+                if sidecar.exists():
+                    os.replace(sidecar, output_path.with_suffix(suffix))
+        os.replace(tmp_path, output_path)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return output_path
+
+
+class VectorBatchWriter:
+    """Context manager that grows one output file batch by batch
+
+    Supports GeoPackage layers, FlatGeobuf and row-grouped GeoParquet. Only
+    the batch being written is held in memory. The first batch fixes the
+    schema and CRS; later batches must match them. The output is assembled
+    at a temporary path and renamed into place when the block exits
+    cleanly, and discarded if it raises.
+    """
+
+    def __init__(self, output_path: Path, driver: str, layer: Optional[str] = None,
+                 compression: str = "snappy", spatial_index: bool = True):
+        if driver not in ("GPKG", "FlatGeobuf", "Parquet"):
+            raise ValueError(f"Batch writing is not supported for driver: {driver}")
+        self.output_path = Path(output_path)
+        self.driver = driver
+        self.layer = layer or self.output_path.stem
+        self.compression = compression
+        self.spatial_index = spatial_index
+        self.columns = None
+        self.dtypes = None
+        self.crs = None
+        self.rows_written = 0
+        self._tmp_dir = None
+        self._parquet_writer = None
+        self._parquet_schema = None
+
+    def __enter__(self) -> "VectorBatchWriter":
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_dir = Path(tempfile.mkdtemp(prefix=f".{self.output_path.name}.", suffix=".tmp",
+                                              dir=self.output_path.parent))
+        return self
+
+    @property
+    def _tmp_path(self) -> Path:
+        return self._tmp_dir / self.output_path.name
+
+    @property
+    def _staging_path(self) -> Path:
+        # FlatGeobuf cannot be appended to, so batches are staged in a GeoPackage
+        return self._tmp_dir / f"{self.output_path.stem}.staging.gpkg"
+
+    def _check_batch(self, gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+        if self.columns is None:
+            self.columns = list(gdf.columns)
+            self.dtypes = gdf.dtypes
+            self.crs = gdf.crs
+            return gdf
+        if set(gdf.columns) != set(self.columns):
+            raise ValueError(f"Batch columns {list(gdf.columns)} do not match {self.columns}")
+        if gdf.crs != self.crs:
+            raise ValueError(f"Batch CRS {gdf.crs} does not match {self.crs}")
+        # All-null columns carry no values to convert, so any dtype is accepted for them
+        mismatched = [f"{column} ({gdf[column].dtype}, expected {self.dtypes[column]})"
+                      for column in self.columns
+                      if gdf[column].dtype != self.dtypes[column] and gdf[column].notna().any()]
+        if mismatched:
+            raise ValueError(f"Batch column types do not match the first batch: {', '.join(mismatched)}")
+        return gdf[self.columns]
+
+    def write(self, gdf: gpd.GeoDataFrame) -> None:
+        """Append one batch to the output"""
+        if self._tmp_dir is None:
+            raise RuntimeError("VectorBatchWriter must be used as a context manager")
+        if len(gdf) == 0:
+            return
+        gdf = self._check_batch(gdf)
+
+        if self.driver == "Parquet":
+            self._write_parquet(gdf)
+        else:
+            target = self._tmp_path if self.driver == "GPKG" else self._staging_path
+            options = _ogr_engine_kwargs()
+            if self.driver == "GPKG":
+                options["SPATIAL_INDEX"] = "YES" if self.spatial_index else "NO"
+            gdf.to_file(target, driver="GPKG", layer=self.layer,
+                        mode="w" if self.rows_written == 0 else "a", **options)
+        self.rows_written += len(gdf)
+
+    def _write_parquet(self, gdf: gpd.GeoDataFrame) -> None:
+        import json
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        import shapely
+
+        geometry_name = gdf.geometry.name
+        attributes = pd.DataFrame(gdf.drop(columns=geometry_name))
+        table = pa.Table.from_pandas(attributes, preserve_index=False)
+        table = table.append_column(geometry_name,
+                                    pa.array(shapely.to_wkb(gdf.geometry.values), type=pa.binary()))
+        # GeoParquet 1.1 bbox covering column; its row-group statistics let
+        # readers skip row groups spatially
+        bounds = shapely.bounds(gdf.geometry.values)
+        table = table.append_column("bbox", pa.StructArray.from_arrays(
+            [pa.array(bounds[:, i]) for i in range(4)], names=["xmin", "ymin", "xmax", "ymax"]))
+
+        if self._parquet_writer is None:
+            geo = {
+                "version": "1.1.0",
+                "primary_column": geometry_name,
+                "columns": {geometry_name: {
+                    "encoding": "WKB",
+                    "geometry_types": [],
+                    "crs": self.crs.to_json_dict() if self.crs is not None else None,
+                    "covering": {"bbox": {axis: ["bbox", axis]
+                                          for axis in ("xmin", "ymin", "xmax", "ymax")}},
+                }},
+            }
+            metadata = dict(table.schema.metadata or {})
+            metadata[b"geo"] = json.dumps(geo).encode()
+            self._parquet_schema = table.schema.with_metadata(metadata)
+            self._parquet_writer = pq.ParquetWriter(self._tmp_path, self._parquet_schema,
+                                                    compression=self.compression)
+        self._parquet_writer.write_table(table.cast(self._parquet_schema))
+
+    def _finalize_flatgeobuf(self) -> None:
+        import pyogrio
+        from pyogrio.raw import write_arrow
+
+        with pyogrio.open_arrow(self._staging_path, layer=self.layer, use_pyarrow=True) as (meta, reader):
+            write_arrow(reader, self._tmp_path, driver="FlatGeobuf",
+                        geometry_name=meta["geometry_name"] or "wkb_geometry",
+                        geometry_type=meta["geometry_type"], crs=meta["crs"],
+                        layer_options={"SPATIAL_INDEX": "YES" if self.spatial_index else "NO"})
+
+    def close(self) -> Path:
+        """Finish the output and move it into place"""
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        if self.rows_written == 0:
+            raise ValueError("No features were written")
+        if self.driver == "FlatGeobuf":
+            self._finalize_flatgeobuf()
+        os.replace(self._tmp_path, self.output_path)
+        return self.output_path
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self.close()
+            elif self._parquet_writer is not None:
+                self._parquet_writer.close()
+        finally:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+            self._tmp_dir = None
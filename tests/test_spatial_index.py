@@ -0,0 +1,21 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import shapely
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from data_processing.spatial_index import PackedRTree
+
+
+def test_empty_geometry_does_not_hide_other_boxes(tmp_path):
+    rng = np.random.default_rng(0)
+    points = list(shapely.points(rng.random((1000, 2))))
+    geometries = points + [shapely.Point(), None]
+
+    tree = PackedRTree.from_geometries(geometries)
+    assert np.array_equal(tree.query((0, 0, 1, 1)), np.arange(1000))
+
+    reloaded = PackedRTree.load(tree.save(tmp_path / "points.sidx"))
+    assert np.array_equal(reloaded.query((0, 0, 1, 1)), np.arange(1000))